@@ -0,0 +1,149 @@
+"""
+게이트웨이 없이 핸들러를 호출하기 위한 가짜 Discord 객체들.
+실제 commands.Bot을 로그인 없이 만들고, 핸들러가 쓰는 속성만 흉내 낸다.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import discord
+from discord.ext import commands
+
+BOT_USER_ID = 1
+
+
+def make_bot() -> commands.Bot:
+    intents = discord.Intents.default()
+    intents.members = True
+    bot = commands.Bot(command_prefix=".", intents=intents)
+    bot._connection.user = SimpleNamespace(id=BOT_USER_ID)
+    return bot
+
+
+def reaction_payload(message_id: int, user_id: int, emoji: str = "✅"):
+    return SimpleNamespace(message_id=message_id, user_id=user_id, emoji=emoji)
+
+
+class FakeUser:
+    def __init__(self, user_id: int, latency: float = 0.0):
+        self.id = user_id
+        self.bot = False
+        self.name = self.display_name = f"user{user_id}"
+        self.latency = latency
+        self.dms: list[str] = []
+
+    async def send(self, content=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        self.dms.append(content)
+
+
+class FakeMember(FakeUser):
+    async def edit(self, nick=None):
+        await asyncio.sleep(self.latency)
+        self.display_name = nick
+
+
+class FakeGuild:
+    def __init__(self, owner_id: int = 0):
+        self.id = 1
+        self.owner_id = owner_id
+        self.members: dict[int, FakeMember] = {}
+
+    def get_member(self, user_id: int):
+        return self.members.setdefault(user_id, FakeMember(user_id))
+
+    def get_channel(self, channel_id):
+        return None
+
+    async def query_members(self, user_ids=None, limit=100):
+        return [self.get_member(uid) for uid in user_ids]
+
+
+class FakeReaction:
+    def __init__(self, user_ids: list[int], latency: float = 0.0, emoji: str = "✅", between_pages=None):
+        self.emoji = emoji
+        self.me = True
+        self.count = len(user_ids) + 1
+        self.user_ids = user_ids
+        self.latency = latency
+        self.between_pages = between_pages  # 첫 페이지를 받은 뒤 한 번 실행할 코루틴 함수 (조회 중 반응 흉내)
+
+    async def users(self, limit=None):
+        # 실제 API처럼 100명 단위 페이지마다 왕복 지연
+        for i, uid in enumerate(self.user_ids):
+            if i % 100 == 0:
+                if i and self.between_pages:
+                    await self.between_pages()
+                    self.between_pages = None
+                await asyncio.sleep(self.latency)
+            yield SimpleNamespace(id=uid)
+
+
+class FakeChannel:
+    """reconcile이 쓰는 fetch_message만 흉내 (message_id → ✅ 반응한 유저 id 목록)"""
+
+    def __init__(self, reactors: dict[int, list[int]], latency: float = 0.0, between_pages=None):
+        self.reactors = reactors
+        self.latency = latency
+        self.between_pages = between_pages
+
+    async def fetch_message(self, message_id: int):
+        await asyncio.sleep(self.latency)
+        reactions = [FakeReaction(self.reactors.get(message_id, []), self.latency, between_pages=self.between_pages)]
+        return SimpleNamespace(id=message_id, reactions=reactions)
+
+
+class FakeDMBot:
+    """tasks.dm_fanout이 쓰는 get_user / fetch_user / guilds만 흉내"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.users: dict[int, FakeUser] = {}
+        self.guilds = []
+
+    def get_user(self, user_id: int):
+        return self.users.setdefault(user_id, FakeUser(user_id, self.latency))
+
+    async def fetch_user(self, user_id: int):
+        return self.get_user(user_id)
+
+
+class _Response:
+    def __init__(self):
+        self.sent = []
+        self._done = False
+
+    def is_done(self):
+        return self._done
+
+    async def send_message(self, content=None, **kwargs):
+        self._done = True
+        self.sent.append((content, kwargs))
+
+    async def defer(self, **kwargs):
+        self._done = True
+
+    async def send_modal(self, modal):
+        self._done = True
+        self.sent.append(("modal", {"modal": modal}))
+
+
+class _Followup:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append((content, kwargs))
+
+
+class FakeInteraction:
+    def __init__(self, user_id: int, guild: FakeGuild | None = None, message_id: int | None = None,
+                 administrator: bool = False):
+        self.guild = guild or FakeGuild()
+        self.user = self.guild.get_member(user_id)
+        self.user.guild_permissions = SimpleNamespace(administrator=administrator)
+        self.message = SimpleNamespace(id=message_id) if message_id else None
+        self.channel = None
+        self.client = None
+        self.command = None
+        self.response = _Response()
+        self.followup = _Followup()
@@ -0,0 +1,184 @@
+"""
+supabase_storage와 같은 함수 집합을 메모리로 흉내 내는 가짜 저장소.
+내부에는 PostgREST 행(dict) 그대로 보관하고, 반환할 때만 Raid / User로 변환한다.
+install()로 supabase_storage 모듈의 함수를 바꿔 끼우면 RaidStore / UserDirectory / DeliveryLedger가
+네트워크 없이 이쪽을 호출한다. latency로 왕복 지연을 흉내 낼 수 있다.
+"""
+import asyncio
+from uuid import uuid4
+
+import supabase_storage
+from models import Raid, User
+from utils.datetime_util import parse_kst, to_key, to_timestamptz
+
+_FUNCTIONS = [
+    "register_user", "get_user", "get_users", "get_user_by_nickname",
+    "create_raid", "get_all_raids", "get_upcoming_raids", "get_raid_by_key", "delete_raid_by_key",
+    "create_raids", "get_raids_between", "update_raid_message_ids",
+    "update_raid", "update_raid_message_id", "get_raid_by_message_id",
+    "update_raid_participants", "get_all_users",
+    "get_reminder_deliveries", "record_reminder_deliveries",
+    "get_raids_before", "delete_raids", "delete_reminder_deliveries", "archive_raids", "get_archived_raids",
+]
+
+
+class FakeStorage:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.raids: dict[str, dict] = {}
+        self.archive: dict[str, dict] = {}
+        self.users: dict[str, dict] = {}
+        self.deliveries: set[tuple] = set()
+        self.calls: dict[str, int] = {}
+
+    async def _roundtrip(self, name: str):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        await asyncio.sleep(self.latency)
+
+    # ---------- 유저 ----------
+    async def register_user(self, discord_id, nickname, level, job):
+        await self._roundtrip("register_user")
+        self.users[str(discord_id)] = {"discord_id": str(discord_id), "nickname": nickname, "level": level, "job": job}
+
+    async def get_user(self, discord_id):
+        await self._roundtrip("get_user")
+        row = self.users.get(str(discord_id))
+        return User.from_row(row) if row else None
+
+    async def get_users(self, discord_ids):
+        await self._roundtrip("get_users")
+        return [User.from_row(self.users[str(i)]) for i in discord_ids if str(i) in self.users]
+
+    async def get_user_by_nickname(self, nickname):
+        await self._roundtrip("get_user_by_nickname")
+        for user in self.users.values():
+            if user["nickname"] == nickname:
+                return User.from_row(user)
+        return None
+
+    async def get_all_users(self):
+        await self._roundtrip("get_all_users")
+        return {int(i): User.from_row(row) for i, row in self.users.items()}
+
+    # ---------- 일정 ----------
+    async def create_raid(self, datetime_str, max_participants, note, reminder_offsets=None):
+        await self._roundtrip("create_raid")
+        raid = {
+            "id": str(uuid4()), "datetime": to_timestamptz(datetime_str), "max_participants": max_participants, "note": note,
+            "participants": [], "waitlist": [], "reminder_offsets": reminder_offsets, "message_id": None,
+        }
+        self.raids[raid["id"]] = raid
+        return Raid.from_row(raid)
+
+    async def create_raids(self, datetime_strs, max_participants, note, reminder_offsets=None):
+        await self._roundtrip("create_raids")
+        rows = [{
+            "id": str(uuid4()), "datetime": to_timestamptz(dt), "max_participants": max_participants, "note": note,
+            "participants": [], "waitlist": [], "reminder_offsets": reminder_offsets, "message_id": None,
+        } for dt in datetime_strs]
+        self.raids.update((row["id"], row) for row in rows)
+        return [Raid.from_row(row) for row in rows]
+
+    async def get_raids_between(self, start, end):
+        await self._roundtrip("get_raids_between")
+        rows = sorted((r for r in self.raids.values() if start <= parse_kst(r["datetime"]) < end),
+                      key=lambda r: parse_kst(r["datetime"]))
+        return [Raid.from_row(r) for r in rows]
+
+    async def update_raid_message_ids(self, message_ids):
+        await self._roundtrip("update_raid_message_ids")
+        for raid_id, message_id in message_ids.items():
+            if raid_id in self.raids:
+                self.raids[raid_id]["message_id"] = message_id
+
+    async def get_all_raids(self):
+        await self._roundtrip("get_all_raids")
+        return [Raid.from_row(r) for r in self.raids.values()]
+
+    async def get_upcoming_raids(self, since, limit=None):
+        await self._roundtrip("get_upcoming_raids")
+        upcoming = sorted((r for r in self.raids.values() if parse_kst(r["datetime"]) >= since),
+                          key=lambda r: parse_kst(r["datetime"]))
+        return [Raid.from_row(r) for r in (upcoming[:limit] if limit else upcoming)]
+
+    async def get_raids_before(self, cutoff, limit):
+        await self._roundtrip("get_raids_before")
+        past = sorted((r for r in self.raids.values() if parse_kst(r["datetime"]) < cutoff),
+                      key=lambda r: parse_kst(r["datetime"]))
+        return [Raid.from_row(r) for r in past[:limit]]
+
+    async def delete_raids(self, raid_ids):
+        await self._roundtrip("delete_raids")
+        for raid_id in raid_ids:
+            self.raids.pop(raid_id, None)
+
+    async def get_raid_by_key(self, key):
+        await self._roundtrip("get_raid_by_key")
+        row = next((r for r in self.raids.values() if to_key(r["datetime"]) == to_key(key)), None)
+        return Raid.from_row(row) if row else None
+
+    async def delete_raid_by_key(self, key):
+        await self._roundtrip("delete_raid_by_key")
+        self.raids = {i: r for i, r in self.raids.items() if to_key(r["datetime"]) != to_key(key)}
+
+    async def update_raid(self, raid_id, new_datetime, max_participants, note, reminder_offsets=None, edited_at=None):
+        await self._roundtrip("update_raid")
+        if raid_id in self.raids:
+            self.raids[raid_id].update(datetime=to_timestamptz(new_datetime), max_participants=max_participants,
+                                       note=note, reminder_offsets=reminder_offsets,
+                                       edited_at=edited_at.isoformat(timespec="seconds") if edited_at else None)
+
+    async def update_raid_message_id(self, raid_id, message_id):
+        await self._roundtrip("update_raid_message_id")
+        if raid_id in self.raids:
+            self.raids[raid_id]["message_id"] = message_id
+
+    async def get_raid_by_message_id(self, message_id):
+        await self._roundtrip("get_raid_by_message_id")
+        row = next((r for r in self.raids.values() if r.get("message_id") == message_id), None)
+        return Raid.from_row(row) if row else None
+
+    async def update_raid_participants(self, raid_id, participants, waitlist):
+        await self._roundtrip("update_raid_participants")
+        if raid_id in self.raids:
+            self.raids[raid_id]["participants"] = [str(uid) for uid in participants]
+            self.raids[raid_id]["waitlist"] = [str(uid) for uid in waitlist]
+
+    # ---------- 리마인더 발송 기록 ----------
+    async def get_reminder_deliveries(self, raid_ids):
+        await self._roundtrip("get_reminder_deliveries")
+        wanted = set(raid_ids)
+        return [{"raid_id": r, "offset_minutes": o, "user_id": u} for r, o, u in self.deliveries if r in wanted]
+
+    async def record_reminder_deliveries(self, rows):
+        await self._roundtrip("record_reminder_deliveries")
+        self.deliveries.update((r["raid_id"], r["offset_minutes"], r["user_id"]) for r in rows)
+
+    async def delete_reminder_deliveries(self, raid_ids):
+        await self._roundtrip("delete_reminder_deliveries")
+        wanted = set(raid_ids)
+        self.deliveries = {d for d in self.deliveries if d[0] not in wanted}
+
+    # ---------- 지난 일정 보관함 ----------
+    async def archive_raids(self, raids):
+        await self._roundtrip("archive_raids")
+        self.archive.update((raid.id, raid.to_row()) for raid in raids)
+
+    async def get_archived_raids(self, limit, since=None):
+        await self._roundtrip("get_archived_raids")
+        rows = [r for r in self.archive.values() if since is None or parse_kst(r["datetime"]) >= since]
+        rows.sort(key=lambda r: parse_kst(r["datetime"]), reverse=True)
+        return [Raid.from_row(r) for r in rows[:limit]]
+
+
+def install(fake: FakeStorage):
+    """supabase_storage 모듈 함수를 가짜로 교체하고, 원래 함수를 돌려준다 (uninstall용)"""
+    originals = {name: getattr(supabase_storage, name) for name in _FUNCTIONS}
+    for name in _FUNCTIONS:
+        setattr(supabase_storage, name, getattr(fake, name))
+    return originals
+
+
+def uninstall(originals: dict):
+    for name, func in originals.items():
+        setattr(supabase_storage, name, func)
@@ -0,0 +1,394 @@
+"""
+핫패스 벤치마크 / 부하 테스트 (네트워크 없이 실행).
+
+    python -m benchmarks.run            # 전체 규모
+    python -m benchmarks.run --quick    # CI용 축소 규모
+
+가짜 저장소(fake_storage)와 가짜 게이트웨이(fake_discord)로 실제 핸들러를 호출하고,
+규모별 처리량과 p50/p99 지연시간, 동시 반응 폭주 시 유실된 신청 수를 출력한다.
+신청 유실이나 순서 뒤바뀜이 있으면 종료 코드 1.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from discord import app_commands
+
+from benchmarks import fake_storage
+from benchmarks.fake_discord import FakeChannel, FakeDMBot, FakeGuild, FakeInteraction, make_bot, reaction_payload
+from raid_store import raid_store
+from tasks import dm_fanout, reconcile, reminder
+from tasks.delivery_ledger import ledger
+from tasks.signup_engine import signup_engine
+from user_directory import user_directory
+from utils.datetime_util import KST
+from views.roster_cache import roster_cache
+
+JOBS = ["다크나이트", "나이트로드", "보우마스터", "비숍", "신궁", "섀도어", "팔라딘", "히어로"]
+
+
+# ---------- 공통 ----------
+def reset_state(fake):
+    """가짜 저장소와 프로세스 전역 캐시/엔진을 초기 상태로"""
+    fake.raids.clear()
+    fake.archive.clear()
+    fake.users.clear()
+    fake.deliveries.clear()
+    fake.calls.clear()
+    raid_store.__init__()
+    user_directory.__init__()
+    roster_cache.__init__()
+    signup_engine.__init__(signup_engine._debounce)
+    ledger.__init__()
+
+
+def summarize(name: str, scale: str, latencies: list[float], elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return {
+        "name": name,
+        "scale": scale,
+        "n": len(latencies),
+        "ops": len(latencies) / elapsed if elapsed else float("inf"),
+        "p50": statistics.median(ordered) * 1000,
+        "p99": p99 * 1000,
+    }
+
+
+async def timed_calls(factory, n: int) -> tuple[list[float], float]:
+    latencies = []
+    started = time.perf_counter()
+    for i in range(n):
+        call_started = time.perf_counter()
+        await factory(i)
+        latencies.append(time.perf_counter() - call_started)
+    return latencies, time.perf_counter() - started
+
+
+async def roster_latencies(dispatch, user_ids: list[int], changed) -> tuple[list[float], float]:
+    """
+    반응을 동시에 전달하고, 전달 시각부터 그 유저의 명단 변경이 캐시에 보일 때까지를 잰다
+    (큐 대기 + 처리 포함). elapsed는 명단 저장까지 모두 끝난 시점 기준.
+    """
+    sent, seen = {}, {}
+
+    def on_change(raid, diff):
+        now = time.perf_counter()
+        for uid in changed(diff):
+            seen.setdefault(uid, now)
+
+    async def one(uid):
+        sent[uid] = time.perf_counter()
+        await dispatch(uid)
+
+    raid_store.add_roster_listener(on_change)
+    started = time.perf_counter()
+    await asyncio.gather(*(one(uid) for uid in user_ids))
+    await wait_signups_idle()
+    elapsed = time.perf_counter() - started
+    return [seen[uid] - sent[uid] for uid in user_ids if uid in seen], elapsed
+
+
+async def seed(fake, raid_count: int, participants: int, max_participants: int = 30) -> list[dict]:
+    """미래 일정 raid_count개 + 각 일정에 participants명 신청 + 유저 등록"""
+    now = datetime.now(KST)
+    raids = []
+    for i in range(raid_count):
+        when = (now + timedelta(days=1, minutes=10 * i)).strftime("%Y-%m-%d %H:%M")
+        raid = await fake.create_raid(when, max_participants, f"note {i}")
+        user_ids = [str(10_000 + j) for j in range(participants)]
+        await fake.update_raid_participants(raid.id, user_ids[:max_participants], user_ids[max_participants:])
+        await fake.update_raid_message_id(raid.id, 1_000_000 + i)
+        raids.append(fake.raids[raid.id])
+    for j in range(participants):
+        uid = str(10_000 + j)
+        fake.users[uid] = {"discord_id": uid, "nickname": f"n{uid}", "level": 100, "job": JOBS[j % len(JOBS)]}
+    fake.calls.clear()
+    return raids
+
+
+async def wait_signups_idle():
+    while signup_engine._workers or signup_engine._flushers:
+        await asyncio.sleep(0.005)
+
+
+# ---------- 시나리오 ----------
+async def bench_reaction_burst(bot, fake, raid_count: int, burst: int) -> tuple[dict, dict, list[str]]:
+    reset_state(fake)
+    raids = await seed(fake, raid_count, 0, max_participants=max(6, burst // 2))
+    target = raids[0]
+    add = bot.on_raw_reaction_add
+    remove = bot.on_raw_reaction_remove
+    await raid_store.load()
+
+    latencies, add_elapsed = await roster_latencies(
+        lambda uid: add(reaction_payload(target["message_id"], uid)),
+        [50_000 + i for i in range(burst)],
+        lambda diff: diff.added + diff.waitlisted,
+    )
+
+    problems = []
+    expected = [str(50_000 + i) for i in range(burst)]
+    stored = fake.raids[target["id"]]
+    got = stored["participants"] + stored["waitlist"]
+    lost = set(expected) - set(got)
+    if lost:
+        problems.append(f"burst={burst}: {len(lost)} signups lost")
+    if len(got) != len(set(got)):
+        problems.append(f"burst={burst}: duplicate signups")
+    if got != expected:
+        problems.append(f"burst={burst}: signup order not preserved")
+
+    # 절반 취소 → 대기자 승격 확인
+    leavers = expected[: burst // 2]
+    remove_lat, remove_elapsed = await roster_latencies(
+        lambda uid: remove(reaction_payload(target["message_id"], uid)),
+        [int(uid) for uid in leavers],
+        lambda diff: diff.removed,
+    )
+    stored = fake.raids[target["id"]]
+    if set(stored["participants"] + stored["waitlist"]) != set(expected[burst // 2:]):
+        problems.append(f"burst={burst}: roster wrong after removals")
+
+    writes = fake.calls.get("update_raid_participants", 0)
+    scale = f"raids={raid_count} burst={burst} writes={writes}"
+    return (
+        summarize("reaction_add", scale, latencies, add_elapsed),
+        summarize("reaction_remove", scale, remove_lat, remove_elapsed),
+        problems,
+    )
+
+
+async def bench_show_raids(bot, fake, raid_count: int, n: int) -> dict:
+    reset_state(fake)
+    await seed(fake, raid_count, 10)
+    await raid_store.load()
+    callback = bot.tree.get_command("일정확인").callback
+    latencies, elapsed = await timed_calls(lambda i: callback(FakeInteraction(2)), n)
+    return summarize("show_raids", f"raids={raid_count}", latencies, elapsed)
+
+
+async def bench_show_participants(fake, participants: int, n: int) -> dict:
+    from views.raid_controls import RaidControlView
+
+    reset_state(fake)
+    raids = await seed(fake, 1, participants)
+    await raid_store.load()
+    view = RaidControlView()
+    message_id = raids[0]["message_id"]
+    latencies, elapsed = await timed_calls(
+        lambda i: view.show_participants.callback(FakeInteraction(2, message_id=message_id)), n
+    )
+    return summarize("show_participants", f"participants={participants}", latencies, elapsed)
+
+
+async def bench_register(bot, fake, n: int) -> dict:
+    reset_state(fake)
+    callback = bot.tree.get_command("공대원등록").callback
+    guild = FakeGuild()
+    job = app_commands.Choice(name="비숍", value="비숍")
+    latencies, elapsed = await timed_calls(
+        lambda i: callback(FakeInteraction(20_000 + i, guild=guild), f"user{i}", 100, job), n
+    )
+    return summarize("register", f"users={n}", latencies, elapsed)
+
+
+async def bench_reminders(fake, raid_count: int, participants: int) -> tuple[dict, dict]:
+    reset_state(fake)
+    raids = await seed(fake, raid_count, participants)
+    await raid_store.load()
+
+    scheduler = reminder.ReminderScheduler()
+    started = time.perf_counter()
+    scheduler.rebuild(await raid_store.all())
+    took = time.perf_counter() - started
+    rebuild = summarize("reminder_rebuild", f"raids={raid_count}", [took], took)
+
+    latencies, elapsed = await timed_calls(
+        lambda i: reminder.send_raid_reminder(raid_store._by_id[raids[i]["id"]], 60), min(raid_count, 20)
+    )
+    dispatch = summarize("reminder_dispatch", f"participants={participants}", latencies, elapsed)
+    return rebuild, dispatch
+
+
+async def bench_reconcile(fake, raid_count: int, participants: int, latency: float) -> tuple[dict, list[str]]:
+    reset_state(fake)
+    raids = await seed(fake, raid_count, participants)
+    await raid_store.load()
+
+    # 일정마다 저장된 명단에서 2명 빠지고 3명 새로 반응한 상태
+    reactors = {}
+    for i, raid in enumerate(raids):
+        stored = [int(uid) for uid in raid["participants"] + raid["waitlist"]]
+        reactors[raid["message_id"]] = stored[2:] + [90_000 + i * 10 + k for k in range(3)]
+    channel = FakeChannel(reactors, latency)
+    bot = SimpleNamespace(user=SimpleNamespace(id=1), get_channel=lambda _: channel)
+
+    report = await reconcile.reconcile_signups(bot)
+    problems = []
+    if (report.added, report.removed, report.writes) != (3 * raid_count, 2 * raid_count, raid_count):
+        problems.append(f"reconcile raids={raid_count}: unexpected corrections ({report.summary()})")
+    for raid in raids:
+        stored = fake.raids[raid["id"]]
+        if {int(u) for u in stored["participants"] + stored["waitlist"]} != set(reactors[raid["message_id"]]):
+            problems.append(f"reconcile raids={raid_count}: roster differs from reactions")
+            break
+    scale = f"raids={raid_count} participants={participants}"
+    return summarize("reconcile", scale, [report.elapsed], report.elapsed), problems
+
+
+async def bench_reconcile_race(bot, fake, latency: float) -> tuple[dict, list[str]]:
+    """반응 목록을 페이지로 받는 도중 들어온 ✅ 추가/취소를 명단 대조가 되돌리지 않는지"""
+    reset_state(fake)
+    raid = (await seed(fake, 1, 3))[0]
+    await raid_store.load()
+    message_id = raid["message_id"]
+    stored = [int(uid) for uid in raid["participants"]]
+    snapshot = stored + [90_000 + k for k in range(250)]  # 3페이지
+    late_join, late_leave = 42, stored[-1]
+
+    async def react_while_paging():
+        await bot.on_raw_reaction_add(reaction_payload(message_id, late_join))
+        await bot.on_raw_reaction_remove(reaction_payload(message_id, late_leave))
+        while signup_engine._workers:
+            await asyncio.sleep(0.001)
+
+    channel = FakeChannel({message_id: snapshot}, latency, between_pages=react_while_paging)
+    client = SimpleNamespace(user=SimpleNamespace(id=1), get_channel=lambda _: channel)
+    report = await reconcile.reconcile_signups(client)
+    await wait_signups_idle()
+
+    problems = []
+    row = fake.raids[raid["id"]]
+    got = {int(u) for u in row["participants"] + row["waitlist"]}
+    expected = (set(snapshot) - {late_leave}) | {late_join}
+    if got != expected:
+        problems.append(f"reconcile race: live reactions overridden "
+                        f"(missing {sorted(expected - got)[:5]}, extra {sorted(got - expected)[:5]})")
+    return summarize("reconcile_race", "reactors=253", [report.elapsed], report.elapsed), problems
+
+
+async def bench_warm_start(fake, latency: float) -> tuple[dict, list[str]]:
+    """스냅샷으로 시작한 뒤 (저장소 장애 → 재검증 중) 들어온 신청이 스냅샷 명단으로 덮어써지지 않는지"""
+    from tasks import snapshot as snapshot_module
+    from tasks.snapshot import snapshot
+
+    snapshot_module.REVALIDATE_RETRY = 0
+    reset_state(fake)
+    raid = (await seed(fake, 1, 0))[0]
+    await raid_store.load()
+    message_id = raid["message_id"]
+    await snapshot.save()
+    fake.raids[raid["id"]]["participants"] = ["1", "2", "3"]  # 스냅샷 이후 저장된 신청
+
+    raid_store.__init__()
+    load = fake.get_upcoming_raids
+    failures = [ConnectionError("storage down")] * 2
+
+    async def flaky_load(*args, **kwargs):
+        if failures:
+            raise failures.pop()
+        await asyncio.sleep(latency + 0.01)  # 로드 도중 반응이 들어오도록
+        return await load(*args, **kwargs)
+
+    fake_storage.supabase_storage.get_upcoming_raids = flaky_load
+    problems = []
+    started = time.perf_counter()
+    try:
+        snapshot.restore()
+        signup_engine.join(message_id, 4)  # 장애 중
+        await asyncio.sleep(0.02)
+        revalidate = asyncio.create_task(snapshot._revalidate())
+        await asyncio.sleep(0.005)
+        signup_engine.join(message_id, 5)  # 재검증 로드 중
+        await revalidate
+        await wait_signups_idle()
+    finally:
+        fake_storage.supabase_storage.get_upcoming_raids = fake.get_upcoming_raids
+    elapsed = time.perf_counter() - started
+
+    got = fake.raids[raid["id"]]["participants"]
+    if got != ["1", "2", "3", "4", "5"]:
+        problems.append(f"warm start: snapshot roster overwrote storage (got {got})")
+    return summarize("warm_start", "outage + reload", [elapsed], elapsed), problems
+
+
+# ---------- 실행 ----------
+async def main(quick: bool, latency_ms: float) -> int:
+    # outbox 등 로컬 상태 파일은 임시 디렉터리에
+    os.environ["BOT_STATE_DIR"] = tempfile.mkdtemp(prefix="bench-state-")
+    fake = fake_storage.FakeStorage(latency=latency_ms / 1000)
+    originals = fake_storage.install(fake)
+    dm_fanout.set_bot_instance(FakeDMBot(latency=latency_ms / 1000))
+    reminder.DEBUG = False
+    signup_engine._debounce = 0.05
+
+    # 핸들러 등록 (main.py와 같은 setup 함수 사용)
+    from commands.reaction_handler import setup_reaction_handler
+    from commands.register import setup_register_command
+    from commands.show_schdule import setup_show_raids_command
+
+    bot = make_bot()
+    setup_reaction_handler(bot)
+    setup_register_command(bot)
+    setup_show_raids_command(bot)
+
+    raid_counts = [10, 100] if quick else [10, 100, 1000]
+    bursts = [10, 50] if quick else [10, 50, 200]
+    participant_counts = [6, 30] if quick else [6, 30, 100]
+    repeat = 20 if quick else 200
+
+    rows, problems = [], []
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            for burst in bursts:
+                add, remove, found = await bench_reaction_burst(bot, fake, raid_counts[-1], burst)
+                rows += [add, remove]
+                problems += found
+            for count in raid_counts:
+                rows.append(await bench_show_raids(bot, fake, count, repeat))
+            for participants in participant_counts:
+                rows.append(await bench_show_participants(fake, participants, repeat))
+            rows.append(await bench_register(bot, fake, repeat))
+            for count in raid_counts:
+                rows += await bench_reminders(fake, count, participant_counts[-1])
+            for count in raid_counts:
+                row, found = await bench_reconcile(fake, count, participant_counts[-1], latency_ms / 1000)
+                rows.append(row)
+                problems += found
+            row, found = await bench_reconcile_race(bot, fake, latency_ms / 1000)
+            rows.append(row)
+            problems += found
+            row, found = await bench_warm_start(fake, latency_ms / 1000)
+            rows.append(row)
+            problems += found
+        finally:
+            fake_storage.uninstall(originals)
+
+    print(f"{'handler':<20}{'scale':<40}{'n':>6}{'ops/s':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    for r in rows:
+        print(f"{r['name']:<20}{r['scale']:<40}{r['n']:>6}{r['ops']:>12.1f}{r['p50']:>10.3f}{r['p99']:>10.3f}")
+
+    if problems:
+        print("\n❌ signup integrity problems:")
+        for p in problems:
+            print(f"- {p}")
+        return 1
+    print("\n✅ no lost signups")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="mapleland bot hot-path benchmarks")
+    parser.add_argument("--quick", action="store_true", help="CI용 축소 규모")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="가짜 저장소 왕복 지연 (ms)")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.quick, args.latency_ms)))
@@ -1,114 +1,83 @@
 from datetime import datetime, date, timedelta
-import os
 import re
+from collections import Counter
 import asyncio
 import discord
 from discord import app_commands
 from discord.ext import commands
-from notion_client import Client
 from notion_client.errors import APIResponseError
-from zoneinfo import ZoneInfo
 
-KST = ZoneInfo("Asia/Seoul")
+from notion_storage import _extract, date_range_filter, iter_pages
+from tasks.notion_sync import settlement_mirror
+from utils.datetime_util import KST
 
-NOTION_API_KEY = os.getenv("NOTION_API_KEY")
-NOTION_DB_ID = os.getenv("NOTION_DISTRIBUTION_DB_ID") or os.getenv("NOTION_SETTLEMENT_DB_ID")
-
-if not NOTION_API_KEY or not NOTION_DB_ID:
-    raise RuntimeError("Missing NOTION_API_KEY or NOTION_DB_ID")
-
-notion = Client(auth=NOTION_API_KEY)
 DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
-
-
-def _num(prop):
-    if not isinstance(prop, dict):
-        return None
-    t = prop.get("type")
-
-    # 기본 number
-    if t == "number":
-        return prop.get("number")
-
-    # formula(number)
-    if t == "formula":
-        f = prop.get("formula") or {}
-        if f.get("type") == "number":
-            return f.get("number")
-
-    # rollup(number)
-    if t == "rollup":
-        r = prop.get("rollup") or {}
-        if r.get("type") == "number":
-            return r.get("number")
-
-
-def _date_prop(prop):  # date -> datetime.date
+MONTH_RE = re.compile(r"^\d{4}-\d{2}$")
+RANGE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})\s*~\s*(\d{4}-\d{2}-\d{2})$")
+
+
+class SettlementSummary:
+    """페이지가 들어오는 대로 누적하는 기간 집계"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.per_person = 0
+        self.by_status = Counter()
+        self.first: date | None = None
+        self.last: date | None = None
+
+    def add(self, info: dict):
+        self.count += 1
+        self.total += info["total"] or 0
+        self.per_person += info["per_person"] or 0
+        self.by_status[info["status"] or "-"] += 1
+        d = info["date"]
+        if d:
+            self.first = min(self.first, d) if self.first else d
+            self.last = max(self.last, d) if self.last else d
+
+
+def _month_start(d: date) -> date:
+    return d.replace(day=1)
+
+
+def _next_month(d: date) -> date:
+    return (d.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _parse_period(text: str | None) -> tuple[date, date] | None:
+    """기간 문자열 → [start, end). 형식이 틀리면 None"""
+    today = datetime.now(KST).date()
+    text = (text or "이번달").strip()
+    if text in ("이번달", "this month"):
+        start = _month_start(today)
+        return start, _next_month(start)
+    if text in ("지난달", "last month"):
+        end = _month_start(today)
+        return _month_start(end - timedelta(days=1)), end
     try:
-        s = (prop or {}).get("date", {}).get("start")
-        return datetime.fromisoformat(s).date() if s else None
-    except Exception:
-        return None
-
-
-def _text(prop):  # title/rich_text -> str
-    arr = (prop or {}).get("title") or (prop or {}).get("rich_text") or []
-    return "".join(x.get("plain_text", "") for x in arr) if arr else ""
-
-
-def _extract(page):
-    props = page.get("properties", {}) if isinstance(page, dict) else {}
-    status = (props.get("정산진행 여부", {}).get("status") or {}).get("name", "")
-    total = _num(props.get("총 수익"))
-    participants = _num(props.get("참여자 수"))
-    per_person = int(_num(props.get("인당 분배금")))
-    if per_person is None and (total is not None) and (participants and participants > 0):
-        per_person = int(total / participants)
-
-    return {
-        "date": _date_prop(props.get("날짜")),
-        "title": _text(props.get("정산 세부 페이지")),
-        "status": status or "-",
-        "participants": participants or 0,
-        "total": total or 0,
-        "per_person": per_person or 0,
-        "url": page.get("url"),
-    }
-
-
-# 동기 Notion 호출을 스레드로 오프로딩
-def _query_by_date_blocking(target: date):
-    start = datetime(target.year, target.month, target.day, tzinfo=KST)
-    end = start + timedelta(days=1)
-    res = notion.databases.query(
-        database_id=NOTION_DB_ID,
-        filter={
-            "and": [
-                {"property": "날짜", "date": {"on_or_after": start.isoformat()}},
-                {"property": "날짜", "date": {"before": end.isoformat()}},
-            ]
-        },
-        sorts=[{"property": "날짜", "direction": "descending"}],
-        page_size=1,
-    )
-    return res.get("results", [])
-
-
-def _query_recent_blocking(limit: int = 25):
-    res = notion.databases.query(
-        database_id=NOTION_DB_ID,
-        sorts=[{"property": "날짜", "direction": "descending"}],
-        page_size=limit,
-    )
-    return res.get("results", [])
-
-
-async def _query_by_date(target: date):
-    return await asyncio.to_thread(_query_by_date_blocking, target)
-
-
-async def _query_recent(limit: int = 25):
-    return await asyncio.to_thread(_query_recent_blocking, limit)
+        if MONTH_RE.match(text):
+            start = date.fromisoformat(f"{text}-01")
+            return start, _next_month(start)
+        m = RANGE_RE.match(text)
+        if m:
+            start, last = date.fromisoformat(m.group(1)), date.fromisoformat(m.group(2))
+            if start <= last:
+                return start, last + timedelta(days=1)
+    except ValueError:
+        pass  # 형식은 맞지만 없는 날짜 (2025-13, 2025-02-30 등)
+    return None
+
+
+async def summarize_range(start: date, end: date) -> SettlementSummary:
+    """노션 커서 페이지네이션으로 기간 내 모든 페이지를 받아가며 집계"""
+    summary = SettlementSummary()
+    sorts = [{"property": "날짜", "direction": "ascending"}]
+    async for pages in iter_pages(date_range_filter(start, end), sorts):
+        for page in pages:
+            summary.add(_extract(page))
+    return summary
 
 
 def setup_distribution_command(bot: commands.Bot):
@@ -133,12 +102,15 @@ def setup_distribution_command(bot: commands.Bot):
             await interaction.followup.send("날짜는 `YYYY-MM-DD` 또는 '오늘/어제/최근' 중 하나로 입력해주세요.", ephemeral=True)
             return
 
-        # 2) Notion 호출
+        # 2) 로컬 사본 조회 (아직 첫 동기화 전이면 한 번 기다림)
         try:
+            if not settlement_mirror.synced.is_set():
+                await asyncio.wait_for(settlement_mirror.sync(), timeout=12)
             if target_date is None:
-                pages = await asyncio.wait_for(_query_recent(1), timeout=12)
+                records = settlement_mirror.recent(1)
             else:
-                pages = await asyncio.wait_for(_query_by_date(target_date), timeout=12)
+                record = settlement_mirror.by_date(target_date)
+                records = [record] if record else []
         except asyncio.TimeoutError:
             await interaction.followup.send("⏳ Notion 응답이 지연됩니다. 잠시 후 다시 시도해주세요.", ephemeral=True)
             return
@@ -149,11 +121,11 @@ def setup_distribution_command(bot: commands.Bot):
             await interaction.followup.send(f"⚠️ 오류가 발생했어요: {e}", ephemeral=True)
             return
 
-        if not pages:
+        if not records:
             await interaction.followup.send("해당 조건의 정산 정보를 찾지 못했어요.", ephemeral=True)
             return
 
-        info = _extract(pages[0])
+        info = records[0]
         title = info['title'] or str(info['date'])
 
         embed = discord.Embed(
@@ -169,25 +141,79 @@ def setup_distribution_command(bot: commands.Bot):
 
         await interaction.followup.send(embed=embed, ephemeral=True)
 
-    # 3) 자동완성: 최근 날짜 10개 제안 (접두어 매칭)
+    # 3) 자동완성: 로컬 사본의 최근 날짜 제안 (접두어 매칭, 네트워크 호출 없음)
     @distribution.autocomplete("날짜")
     async def date_auto(interaction: discord.Interaction, current: str):
-        try:
-            pages = await asyncio.wait_for(_query_recent(limit=10), timeout=8)
-        except Exception:
-            return []
-        # 노션 날짜 → 'YYYY-MM-DD' 문자열로 변환
-        dates = []
-        for p in pages:
-            d = _date_prop(p.get("properties", {}).get("날짜"))
-            if d:
-                s = d.isoformat()
-                if s not in dates:
-                    dates.append(s)
         # 키워드 + 접두어 필터
         base = ["오늘", "어제", "최근"]
-        candidates = base + dates
         if current:
-            candidates = [c for c in candidates if c.startswith(current)]
+            candidates = [c for c in base + settlement_mirror.dates() if c.startswith(current)]
+        else:
+            candidates = base + settlement_mirror.dates(limit=10)
         # 10개 제한
-        return [app_commands.Choice(name=c, value=c) for c in candidates[:10]]
\ No newline at end of file
+        return [app_commands.Choice(name=c, value=c) for c in candidates[:10]]
+
+    # 4) 기간 집계: 기간 내 모든 정산을 노션에서 받아 합산
+    @bot.tree.command(name="정산통계", description="기간별 정산 합계를 노션 DB에서 집계합니다.")
+    @app_commands.describe(기간="'이번달'/'지난달', YYYY-MM 또는 YYYY-MM-DD~YYYY-MM-DD (기본: 이번달)")
+    async def settlement_stats(interaction: discord.Interaction, 기간: str | None = None):
+        await interaction.response.defer(ephemeral=True)
+
+        period = _parse_period(기간)
+        if period is None:
+            await interaction.followup.send(
+                "기간은 `이번달`/`지난달`, `YYYY-MM` 또는 `YYYY-MM-DD~YYYY-MM-DD` 형식으로 입력해주세요.",
+                ephemeral=True
+            )
+            return
+        start, end = period
+
+        try:
+            summary = await asyncio.wait_for(summarize_range(start, end), timeout=60)
+        except asyncio.TimeoutError:
+            await interaction.followup.send("⏳ Notion 응답이 지연됩니다. 잠시 후 다시 시도해주세요.", ephemeral=True)
+            return
+        except APIResponseError as e:
+            await interaction.followup.send(f"⚠️ Notion API 오류({e.status}). 통합 권한/DB ID를 확인해주세요.", ephemeral=True)
+            return
+        except Exception as e:
+            await interaction.followup.send(f"⚠️ 오류가 발생했어요: {e}", ephemeral=True)
+            return
+
+        if not summary.count:
+            await interaction.followup.send("해당 기간의 정산 정보를 찾지 못했어요.", ephemeral=True)
+            return
+
+        last_day = end - timedelta(days=1)
+        embed = discord.Embed(
+            title=f"📊 정산 통계 ({start.isoformat()} ~ {last_day.isoformat()})",
+            color=discord.Color.blurple()
+        )
+        embed.add_field(name="정산 건수", value=f"{summary.count}건", inline=True)
+        embed.add_field(name="총 수익 합계", value=f"{int(summary.total):,}원", inline=True)
+        embed.add_field(name="인당 분배금 합계", value=f"{summary.per_person:,}원", inline=True)
+        embed.add_field(name="건당 평균 수익", value=f"{int(summary.total // summary.count):,}원", inline=True)
+        embed.add_field(
+            name="정산 상태",
+            value="\n".join(f"- {status}: {n}건" for status, n in summary.by_status.most_common()),
+            inline=False
+        )
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    # 5) 수동 재동기화 (관리자 전용)
+    @bot.tree.command(name="정산동기화", description="노션 정산 DB를 다시 불러옵니다. (관리자 전용)")
+    async def resync(interaction: discord.Interaction):
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message("❌ 관리자만 사용할 수 있습니다.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            changed = await settlement_mirror.sync(full=True)
+        except APIResponseError as e:
+            await interaction.followup.send(f"⚠️ Notion API 오류({e.status}). 통합 권한/DB ID를 확인해주세요.", ephemeral=True)
+            return
+        except Exception as e:
+            await interaction.followup.send(f"⚠️ 오류가 발생했어요: {e}", ephemeral=True)
+            return
+        await interaction.followup.send(f"✅ 정산 정보 {changed}건을 다시 불러왔어요.", ephemeral=True)
\ No newline at end of file
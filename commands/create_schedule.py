@@ -1,20 +1,22 @@
-import os
 import discord
 from discord.ext import commands
-from supabase_storage import create_raid, get_all_raids
+from config import settings
+from raid_store import raid_store
 from datetime import datetime
-import asyncio
+from utils.datetime_util import KST
 
+from tasks.outbox import outbox
+from tasks.reminder import parse_offsets
+from views.announcement import announcement_embed
 from views.raid_controls import RaidControlView
 
-RAID_ANNOUNCEMENT_CHANNEL_ID = int(os.getenv("RAID_ANNOUNCEMENT_CHANNEL_ID"))
-
 
 class CreateRaidModal(discord.ui.Modal, title="자쿰 공대 일정 생성"):
     date = discord.ui.TextInput(label="📅 날짜 (예: 2025-08-10)", placeholder="YYYY-MM-DD")
     time = discord.ui.TextInput(label="⏰ 시간 (예: 21:00)", placeholder="HH:MM")
     max_participants = discord.ui.TextInput(label="👥 최대 인원", placeholder="숫자만 입력", max_length=2)
     note = discord.ui.TextInput(label="📝 특이사항 (예: 듀블 우대, 연습 공대 등)", required=False, style=discord.TextStyle.paragraph)
+    reminders = discord.ui.TextInput(label="⏰ 알림 시점 (분 단위, 예: 1440,60)", placeholder="비우면 24시간 전, 1시간 전", required=False)
 
     def __init__(self, interaction: discord.Interaction):
         super().__init__()
@@ -26,86 +28,72 @@ class CreateRaidModal(discord.ui.Modal, title="자쿰 공대 일정 생성"):
 
         # 관리자 체크
         if not interaction.user.guild_permissions.administrator:
-            await interaction.response.send_message("❌ 이 명령어는 관리자만 사용할 수 있어요.", ephemeral=True)
+            await interaction.followup.send("❌ 이 명령어는 관리자만 사용할 수 있어요.", ephemeral=True)
             return
 
         # 날짜와 시간 파싱/검증
         try:
             raid_datetime = datetime.strptime(f"{self.date.value} {self.time.value}", "%Y-%m-%d %H:%M")
             max_participants = int(self.max_participants.value)
+            reminder_offsets = parse_offsets(self.reminders.value)
         except ValueError:
-            await interaction.response.send_message("❌ 날짜, 시간 또는 인원 형식이 잘못되었습니다.", ephemeral=True)
+            await interaction.followup.send("❌ 날짜, 시간, 인원 또는 알림 시점 형식이 잘못되었습니다.", ephemeral=True)
             return
 
-        if raid_datetime < datetime.now():
-            await interaction.response.send_message("❌ 과거 시점의 일정은 생성할 수 없습니다.", ephemeral=True)
+        if raid_datetime.replace(tzinfo=KST) < datetime.now(KST):
+            await interaction.followup.send("❌ 과거 시점의 일정은 생성할 수 없습니다.", ephemeral=True)
             return
 
         if max_participants < 6:
-            await interaction.response.send_message("❌ 최소 인원은 6명 이상이어야 합니다.", ephemeral=True)
+            await interaction.followup.send("❌ 최소 인원은 6명 이상이어야 합니다.", ephemeral=True)
             return
 
         key = raid_datetime.strftime("%Y-%m-%d %H:%M")
 
-        # 기존 일정 중복 확인 (블로킹 I/O는 스레드로)
+        # 기존 일정 중복 확인 (캐시 인덱스 조회)
         try:
-            raids = await asyncio.to_thread(get_all_raids)
+            duplicate = await raid_store.get_by_key(key)
         except Exception as e:
             await interaction.followup.send(f"⚠️ 일정 조회 중 오류: {e}", ephemeral=True)
             return
-        if any(r["datetime"] == key for r in raids):
-            await interaction.response.send_message(f"⚠️ 이미 `{key}` 일정이 존재합니다.", ephemeral=True)
-            return
-
-        # 공대 일정 메시지를 공지 채널로 전송
-        channel = interaction.client.get_channel(RAID_ANNOUNCEMENT_CHANNEL_ID)
-        if channel is None:
-            try:
-                channel = await interaction.client.fetch_channel(RAID_ANNOUNCEMENT_CHANNEL_ID)
-            except Exception:
-                channel = interaction.channel
-
-        # 안내 메시지 + View 전송
-        try:
-            pretty_when = datetime.strptime(key, "%Y-%m-%d %H:%M").strftime("%Y-%m-%d (%a) %H:%M")
-            embed = discord.Embed(
-                title="🔔 New 자쿰 공대 일정 생성!",
-                description=(
-                    "━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-                    f"📅 **일시:** {pretty_when}\n"
-                    f"👥 **최대 인원:** {max_participants}명\n\n"
-                    "📝 **특이사항:**\n"
-                    f"{(self.note.value or '').strip() or '지금부터 참여 신청 받습니다!'}\n"
-                    "━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-                    "✅ 눌러 참여 신청하세요!"
-                ),
-                color=discord.Color.orange()
-            )
-            view = RaidControlView(raid_key=key)
-            msg = await channel.send(embed=embed, view=view)
-            await msg.add_reaction("✅")
-        except Exception as e:
-            await interaction.followup.send(f"⚠️ 공지 채널로 메시지 전송 실패: {e}", ephemeral=True)
+        if duplicate:
+            await interaction.followup.send(f"⚠️ 이미 `{key}` 일정이 존재합니다.", ephemeral=True)
             return
 
-        # Supabase에 일정 저장
+        # 일정을 먼저 저장하고, 공지 전송은 outbox에 맡긴다 (재시작해도 이어서 전송)
         try:
-            raid_id = await asyncio.to_thread(
-                create_raid,
+            raid_id = await raid_store.create_raid(
                 datetime_str=key,
                 max_participants=max_participants,
-                note=(self.note.value or "").strip()
-            )
-            # message_id 업데이트
-            from supabase_client import supabase
-            await asyncio.to_thread(
-                lambda: supabase.table("raids").update({"message_id": msg.id}).eq("id", raid_id).execute()
+                note=(self.note.value or "").strip(),
+                reminder_offsets=reminder_offsets
             )
         except Exception as e:
             await interaction.followup.send(f"⚠️ 일정 저장 중 오류: {e}", ephemeral=True)
             return
 
-        await interaction.followup.send("✅ 공대 일정이 생성되었고, 공지 채널에 안내 메시지를 보냈어요!", ephemeral=True)
+        outbox.enqueue("announce_raid", {"raid_id": raid_id}, key=f"announce:{raid_id}", raid_id=raid_id)
+        await interaction.followup.send("✅ 공대 일정이 생성되었어요! 공지 채널에 곧 안내 메시지가 올라갑니다.", ephemeral=True)
+
+
+@outbox.handler("announce_raid")
+async def announce_raid(bot, payload: dict):
+    raid = await raid_store.get(payload["raid_id"])
+    if raid is None:
+        return  # 그 사이 삭제됨
+    if raid.message_id:
+        # 이미 공지됨 (message_id 저장만 실패했던 재시도) — 다시 올리지 않고 저장만
+        await raid_store.set_message_id(raid.id, raid.message_id)
+        return
+
+    channel_id = settings.raid_announcement_channel_id
+    channel = bot.get_channel(channel_id) or await bot.fetch_channel(channel_id)
+    msg = await channel.send(embed=announcement_embed(raid), view=RaidControlView())
+    await raid_store.set_message_id(raid.id, msg.id)
+    try:
+        await msg.add_reaction("✅")
+    except Exception as e:
+        print(f"[create_raid] ✅ 반응 추가 실패: {e}")
 
 
 def setup_create_raid_command(bot: commands.Bot):
@@ -1,12 +1,14 @@
-import os
 from datetime import datetime
-from utils.datetime_util import parse_kst, KST
+from utils.datetime_util import KST
 
 import discord
+from discord import app_commands
 from discord.ext import commands
-from supabase_storage import get_all_raids, get_raid_by_key, update_raid
-
-RAID_ANNOUNCEMENT_CHANNEL_ID = int(os.getenv("RAID_ANNOUNCEMENT_CHANNEL_ID"))
+from models import Raid
+from raid_store import raid_store
+from tasks.effects import enqueue_dm
+from tasks.outbox import outbox
+from tasks.reminder import parse_offsets
 
 
 class EditRaidModal(discord.ui.Modal, title="자쿰 일정 수정"):
@@ -14,20 +16,21 @@ class EditRaidModal(discord.ui.Modal, title="자쿰 일정 수정"):
     time = discord.ui.TextInput(label="⏰ 시간 (예: 21:00)", placeholder="HH:MM")
     max_participants = discord.ui.TextInput(label="👥 최대 인원", placeholder="숫자만 입력", max_length=2)
     note = discord.ui.TextInput(label="📝 특이사항", required=False, style=discord.TextStyle.paragraph)
+    reminders = discord.ui.TextInput(label="⏰ 알림 시점 (분 단위, 예: 1440,60)", placeholder="비우면 24시간 전, 1시간 전", required=False)
 
-    def __init__(self, interaction: discord.Interaction, key: str):
+    def __init__(self, interaction: discord.Interaction, key: str, raid: Raid | None):
         super().__init__()
         self.interaction = interaction
         self.key = key
-        self.raid = get_raid_by_key(key) or {}
+        self.raid = raid
 
         # 기존 값 세팅
         if self.raid:
-            dt = datetime.fromisoformat(self.raid["datetime"])
-            self.date.default = dt.strftime("%Y-%m-%d")
-            self.time.default = dt.strftime("%H:%M")
-            self.max_participants.default = str(self.raid["max_participants"])
-            self.note.default = self.raid.get("note", "")
+            self.date.default = self.raid.starts_at.strftime("%Y-%m-%d")
+            self.time.default = self.raid.starts_at.strftime("%H:%M")
+            self.max_participants.default = str(self.raid.max_participants)
+            self.note.default = self.raid.note
+            self.reminders.default = ",".join(str(m) for m in self.raid.reminder_offsets or [])
 
     async def on_submit(self, interaction: discord.Interaction):
         if not interaction.user.guild_permissions.administrator:
@@ -36,122 +39,80 @@ class EditRaidModal(discord.ui.Modal, title="자쿰 일정 수정"):
 
         await interaction.response.defer(ephemeral=True)
 
+        if not raid_store.fresh:
+            await interaction.followup.send("⏳ 저장소와 동기화 중이라 지금은 수정할 수 없어요. 잠시 후 다시 시도해주세요.", ephemeral=True)
+            return
+
         try:
-            new_datetime = datetime.strptime(f"{self.date.value} {self.time.value}", "%Y-%m-%d %H:%M")
+            new_datetime = datetime.strptime(f"{self.date.value} {self.time.value}", "%Y-%m-%d %H:%M").replace(tzinfo=KST)
             max_participants = int(self.max_participants.value)
+            reminder_offsets = parse_offsets(self.reminders.value)
         except ValueError:
-            await interaction.response.send_message("❌ 형식이 잘못되었습니다.", ephemeral=True)
+            await interaction.followup.send("❌ 형식이 잘못되었습니다.", ephemeral=True)
             return
 
         if max_participants < 6:
-            await interaction.response.send_message("❌ 최소 인원은 6명 이상이어야 합니다.", ephemeral=True)
+            await interaction.followup.send("❌ 최소 인원은 6명 이상이어야 합니다.", ephemeral=True)
             return
 
-        raid = get_raid_by_key(self.key)
+        raid = await raid_store.get_by_key(self.key)
         if not raid:
-            await interaction.response.send_message("❌ 해당 일정이 존재하지 않습니다.", ephemeral=True)
+            await interaction.followup.send("❌ 해당 일정이 존재하지 않습니다.", ephemeral=True)
             return
 
-        original_dt = datetime.fromisoformat(raid["datetime"])
-        if new_datetime != original_dt:
-            duplicate = get_raid_by_key(new_datetime.isoformat(timespec="seconds"))  # 또는 적절한 포맷
+        new_key = new_datetime.strftime("%Y-%m-%d %H:%M")
+        if new_datetime != raid.starts_at:
+            duplicate = await raid_store.get_by_key(new_key)
             if duplicate:
-                await interaction.response.send_message("⚠️ 수정하려는 일정이 이미 존재합니다.", ephemeral=True)
+                await interaction.followup.send("⚠️ 수정하려는 일정이 이미 존재합니다.", ephemeral=True)
                 return
 
         # Supabase에서 업데이트
-        update_raid(raid_id=raid["id"], new_datetime=new_datetime.isoformat(), max_participants=max_participants, note=self.note.value.strip())
-
-        # 메시지 수정
-        channel = interaction.guild.get_channel(RAID_ANNOUNCEMENT_CHANNEL_ID)
-        if channel and "message_id" in raid:
-            try:
-                msg = await channel.fetch_message(raid["message_id"])
-
-                for reaction in msg.reactions:
-                    if str(reaction.emoji) == "✅":
-                        async for user in reaction.users():
-                            if not user.bot:
-                                try:
-                                    await user.send(f"🔔 `{new_datetime}` 일정에 변경 사항이 있습니다.\n변경된 내용을 확인해주세요!")
-                                except:
-                                    print(f"[WARN] {user.display_name}님에게 DM 전송 실패")
-
-                old_content = msg.content
-                old_embed = msg.embeds[0]
-
-                new_description = (
-                    "━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-                    f"📅 **일시:** {new_datetime.strftime('%Y-%m-%d (%a) %H:%M')}\n"
-                    f"👥 **최대 인원:** {max_participants}명\n\n"
-                    f"📝 **특이사항:**\n{self.note.value.strip() if self.note.value else '지금부터 참여 신청 받습니다!'}\n"
-                    "━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-                    "✅ 반응을 눌러 참여를 신청하세요!"
-                )
-
-                new_embed = discord.Embed(
-                    title="🔔 변경사항이 있습니다!",
-                    description=new_description,
-                    color=discord.Color.orange()
-                )
-                for field in old_embed.fields:
-                    if field.name.strip() != "✏️ 변경사항이 있습니다":
-                        new_embed.add_field(name=field.name, value=field.value, inline=field.inline)
-
-                new_embed.add_field(
-                    name="✏️ 변경사항이 있습니다",
-                    value=f"수정 시각: <t:{int(datetime.now().timestamp())}:f>",
-                    inline=False
-                )
-
-                await msg.edit(content=old_content, embed=new_embed)
-            except Exception as e:
-                print(f"[ERROR] 메시지 수정 실패: {e}")
-
-        await interaction.response.send_message(f"✅ `{new_datetime}` 일정이 성공적으로 수정되었습니다!", ephemeral=True)
-
-
-class RaidDropdown(discord.ui.Select):
-    def __init__(self, options, parent_interaction: discord.Interaction):
-        super().__init__(placeholder="수정할 일정을 선택하세요", options=options)
-        self.parent_interaction = parent_interaction
-
-    async def callback(self, interaction: discord.Interaction):
-        print(f"[DEBUG] Dropdown selected by {interaction.user.display_name}")
-        try:
-            await interaction.response.send_modal(EditRaidModal(interaction, self.values[0]))
-        except Exception as e:
-            print(f"[ERROR] Modal 호출 실패: {e}")
-            await interaction.response.send_message("❌ 모달을 열 수 없습니다.", ephemeral=True)
-
-
-class RaidSelect(discord.ui.View):
-    def __init__(self, options, parent_interaction: discord.Interaction):
-        super().__init__(timeout=60)
-        self.add_item(RaidDropdown(options, parent_interaction))
+        # 정원 변경으로 승격/대기 전환된 인원은 roster_notifier가 따로 DM
+        diff = await raid_store.update_raid(raid_id=raid.id, new_datetime=new_datetime.isoformat(), max_participants=max_participants, note=self.note.value.strip(), reminder_offsets=reminder_offsets)
+
+        # 공지 수정 / 변경 안내 DM은 outbox에 맡긴다 (같은 일정 안에서는 기록 순서대로 실행)
+        version = raid_store.version(raid.id)
+        if raid.message_id:
+            # 임베드는 실행 시점의 일정 상태로 다시 그린다 (인원 실시간 갱신과 같은 빌더)
+            outbox.enqueue("refresh_announcement", {"raid_id": raid.id},
+                           key=f"edit-embed:{raid.id}:{version}", raid_id=raid.id)
+        enqueue_dm(
+            raid.participants + raid.waitlist,
+            f"🔔 `{new_key}` 일정에 변경 사항이 있습니다.\n변경된 내용을 확인해주세요!",
+            label=f"edit {self.key}",
+            raid_id=raid.id,
+            key=f"edit-dm:{raid.id}:{version}",
+        )
+
+        summary = ""
+        if diff.promoted or diff.demoted:
+            summary = f"\n(대기 → 참여 {len(diff.promoted)}명, 참여 → 대기 {len(diff.demoted)}명)"
+        await interaction.followup.send(f"✅ `{new_key}` 일정이 성공적으로 수정되었습니다!{summary}", ephemeral=True)
+
+
+async def raid_autocomplete(interaction: discord.Interaction, current: str):
+    """예정 일정 자동완성: 메모리의 정렬 인덱스에서 날짜 접두어 → 날짜/특이사항 부분 일치 (네트워크 호출 없음)"""
+    choices = []
+    for raid in raid_store.search(current, limit=25):
+        note = " ".join(raid.note.split())  # 선택지 이름은 한 줄, 100자 제한
+        name = f"{raid.key} · {note}" if note else raid.key
+        choices.append(app_commands.Choice(name=name[:100], value=raid.key))
+    return choices
 
 
 def setup_edit_raid_command(bot: commands.Bot):
     @bot.tree.command(name="일정수정", description="자쿰 공대 일정을 수정합니다. (관리자 전용)")
-    async def edit_raid(interaction: discord.Interaction):
-        raids = get_all_raids()
-
+    @app_commands.describe(일정="수정할 일정 (날짜나 특이사항으로 검색)")
+    @app_commands.autocomplete(일정=raid_autocomplete)
+    async def edit_raid(interaction: discord.Interaction, 일정: str):
         if not interaction.user.guild_permissions.administrator:
             await interaction.response.send_message("❌ 관리자만 사용할 수 있습니다.", ephemeral=True)
             return
 
-        now = datetime.now(KST)
-        upcoming_raids = [r for r in raids if parse_kst(r["datetime"]) >= now]
-
-        if not upcoming_raids:
-            await interaction.response.send_message("⚠️ 수정할 일정이 없습니다.", ephemeral=True)
+        raid = await raid_store.get_by_key(일정)
+        if not raid:
+            await interaction.response.send_message("❌ 해당 일정이 존재하지 않습니다.", ephemeral=True)
             return
 
-        sorted_raids = sorted(upcoming_raids, key=lambda r: r["datetime"])
-        options = [
-            discord.SelectOption(label=raid["datetime"], value=raid["datetime"])
-            for raid in sorted_raids[:25]
-        ]
-
-        view = RaidSelect(options, interaction)
-        await interaction.response.send_message("📋 수정할 일정을 선택하세요", view=view, ephemeral=True)
+        await interaction.response.send_modal(EditRaidModal(interaction, raid.key, raid))
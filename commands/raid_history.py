@@ -0,0 +1,33 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+import supabase_storage as storage
+
+
+def setup_raid_history_command(bot: commands.Bot):
+    @bot.tree.command(name="지난일정", description="보관된 지난 자쿰 일정을 확인합니다.")
+    @app_commands.describe(개수="최근 몇 개의 일정을 볼지 (기본 10, 최대 25)")
+    async def raid_history(interaction: discord.Interaction, 개수: app_commands.Range[int, 1, 25] = 10):
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            raids = await storage.get_archived_raids(개수)
+        except Exception as e:
+            await interaction.followup.send(f"⚠️ 지난 일정을 불러오지 못했어요: {e}", ephemeral=True)
+            return
+
+        if not raids:
+            await interaction.followup.send("📭 보관된 지난 일정이 없습니다.", ephemeral=True)
+            return
+
+        counts = [raid.roster.participant_count for raid in raids]
+        embed = discord.Embed(title="🗂 지난 자쿰 일정", color=discord.Color.dark_grey())
+        embed.description = ""
+        for raid, count in zip(raids, counts):
+            formatted_dt = raid.starts_at.strftime("%Y-%m-%d (%a) %H:%M")
+            embed.description += f"📅 **{formatted_dt}** — {count} / {raid.max_participants}명\n"
+
+        embed.add_field(name="일정 수", value=f"{len(raids)}회", inline=True)
+        embed.add_field(name="평균 참여", value=f"{sum(counts) / len(counts):.1f}명", inline=True)
+        await interaction.followup.send(embed=embed, ephemeral=True)
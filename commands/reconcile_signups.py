@@ -0,0 +1,20 @@
+import discord
+from discord.ext import commands
+
+from tasks.reconcile import reconcile_signups
+
+
+def setup_reconcile_command(bot: commands.Bot):
+    @bot.tree.command(name="명단동기화", description="공지의 ✅ 반응과 참여 명단을 대조해 바로잡습니다. (관리자 전용)")
+    async def reconcile(interaction: discord.Interaction):
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message("❌ 관리자만 사용할 수 있습니다.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            report = await reconcile_signups(interaction.client)
+        except Exception as e:
+            await interaction.followup.send(f"⚠️ 명단 대조 중 오류: {e}", ephemeral=True)
+            return
+        await interaction.followup.send(f"🔄 {report.summary()}", ephemeral=True)
@@ -0,0 +1,138 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+import supabase_storage as storage
+from config import settings
+from raid_store import raid_store
+from tasks.outbox import outbox
+from tasks.reminder import parse_offsets
+from utils.datetime_util import KST
+from views.announcement import announcement_embed
+from views.raid_controls import RaidControlView
+
+# 반복 일정 공지 사이 간격(초) — 채널 메시지 전송 제한(5초에 5개) 안쪽으로 천천히
+ANNOUNCE_INTERVAL = float(os.getenv("RECURRING_ANNOUNCE_INTERVAL", "1.5"))
+MAX_WEEKS = 12
+
+WEEKDAYS = {"월": 0, "화": 1, "수": 2, "목": 3, "금": 4, "토": 5, "일": 6}
+
+
+def parse_weekdays(text: str) -> list[int]:
+    """"화,금" / "화 금" / "화요일,금요일" → [1, 4]"""
+    days = set()
+    for ch in text.replace("요일", "").replace(",", "").replace(" ", ""):
+        if ch not in WEEKDAYS:
+            raise ValueError(f"unknown weekday: {ch}")
+        days.add(WEEKDAYS[ch])
+    if not days:
+        raise ValueError("no weekday")
+    return sorted(days)
+
+
+def expand_slots(weekdays: list[int], hour: int, minute: int, weeks: int, now: datetime) -> list[datetime]:
+    """오늘부터 weeks주 동안 해당 요일/시각 (이미 지난 시각은 제외), 시간순"""
+    today = now.date()
+    slots = []
+    for offset in range(weeks * 7):
+        day = today + timedelta(days=offset)
+        if day.weekday() in weekdays:
+            slot = datetime(day.year, day.month, day.day, hour, minute, tzinfo=KST)
+            if slot > now:
+                slots.append(slot)
+    return slots
+
+
+@outbox.handler("announce_raids")
+async def announce_raids(bot, payload: dict):
+    """반복 일정 공지: 간격을 두고 하나씩 올리고, message_id는 끝에 한 번에 저장"""
+    channel_id = settings.raid_announcement_channel_id
+    channel = bot.get_channel(channel_id) or await bot.fetch_channel(channel_id)
+    posted = False
+    try:
+        for raid_id in payload["raid_ids"]:
+            raid = await raid_store.get(raid_id)
+            if raid is None or raid.message_id:
+                continue  # 그 사이 삭제됐거나 이전 시도에서 이미 공지됨
+            if posted:
+                await asyncio.sleep(ANNOUNCE_INTERVAL)
+            msg = await channel.send(embed=announcement_embed(raid), view=RaidControlView())
+            # 캐시에는 바로 연결해 두어야 저장 전에 눌린 ✅도 일정을 찾는다
+            raid_store.attach_message_id(raid.id, msg.id)
+            posted = True
+            try:
+                await msg.add_reaction("✅")
+            except Exception as e:
+                print(f"[recurring] ✅ 반응 추가 실패: {e}")
+    finally:
+        # 중간에 실패해도 올린 것까지는 저장 (재시도 때 다시 공지하지 않도록)
+        await raid_store.persist_message_ids(payload["raid_ids"])
+
+
+def setup_recurring_raid_command(bot: commands.Bot):
+    @bot.tree.command(name="반복일정생성", description="요일/시간을 정해 여러 주의 자쿰 일정을 한 번에 생성합니다. (관리자 전용)")
+    @app_commands.describe(
+        요일="예: 화,금",
+        시간="예: 21:00",
+        주="오늘부터 몇 주 동안 (최대 12주)",
+        최대인원="일정별 최대 인원",
+        특이사항="모든 일정에 같은 특이사항",
+        알림="분 단위, 예: 1440,60 (비우면 24시간 전, 1시간 전)",
+    )
+    async def create_recurring_raids(
+        interaction: discord.Interaction,
+        요일: str,
+        시간: str,
+        주: app_commands.Range[int, 1, MAX_WEEKS],
+        최대인원: app_commands.Range[int, 6, 99],
+        특이사항: str = "",
+        알림: str = "",
+    ):
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message("❌ 이 명령어는 관리자만 사용할 수 있어요.", ephemeral=True)
+            return
+
+        try:
+            weekdays = parse_weekdays(요일)
+            start_time = datetime.strptime(시간.strip(), "%H:%M")
+            reminder_offsets = parse_offsets(알림)
+        except ValueError:
+            await interaction.response.send_message("❌ 요일, 시간 또는 알림 시점 형식이 잘못되었습니다.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        slots = expand_slots(weekdays, start_time.hour, start_time.minute, 주, datetime.now(KST))
+        if not slots:
+            await interaction.followup.send("⚠️ 생성할 일정이 없습니다.", ephemeral=True)
+            return
+
+        try:
+            # 중복 확인은 기간 범위 조회 한 번 (datetime 인덱스)
+            existing = await storage.get_raids_between(slots[0], slots[-1] + timedelta(minutes=1))
+            taken = {raid.key for raid in existing}
+            keys = [slot.strftime("%Y-%m-%d %H:%M") for slot in slots]
+            new_keys = [key for key in keys if key not in taken]
+            if not new_keys:
+                await interaction.followup.send("⚠️ 해당 일정이 모두 이미 존재합니다.", ephemeral=True)
+                return
+            raids = await raid_store.create_raids(new_keys, 최대인원, 특이사항.strip(), reminder_offsets)
+        except Exception as e:
+            await interaction.followup.send(f"⚠️ 일정 저장 중 오류: {e}", ephemeral=True)
+            return
+
+        # 공지는 outbox에서 순서대로 천천히 (재시작해도 이어서 전송)
+        raid_ids = [raid.id for raid in raids]
+        outbox.enqueue("announce_raids", {"raid_ids": raid_ids}, key=f"announce-batch:{raid_ids[0]}")
+
+        skipped = [key for key in keys if key in taken]
+        message = f"✅ 일정 {len(raids)}개가 생성되었어요! 공지 채널에 차례로 안내 메시지가 올라갑니다."
+        if skipped:
+            message += "\n⚠️ 이미 있는 일정은 건너뛰었어요: " + ", ".join(f"`{key}`" for key in skipped[:10])
+            if len(skipped) > 10:
+                message += f" 외 {len(skipped) - 10}개"
+        await interaction.followup.send(message, ephemeral=True)
@@ -1,6 +1,6 @@
 import discord
 from discord import app_commands
-from supabase_storage import register_user, get_all_users
+from user_directory import user_directory
 
 
 def setup_register_command(bot):
@@ -25,20 +25,20 @@ def setup_register_command(bot):
         level: int,
         job: app_commands.Choice[str],
     ):
-        discord_id = str(interaction.user.id)
+        discord_id = interaction.user.id
         nickname = f"{username}/{level}/{job.value}"
 
-        # 1. 모든 사용자 불러오기
-        registered_users = get_all_users()
+        # 1. 기존 등록 여부 조회
+        existing = await user_directory.get(discord_id)
 
-        # 2. 동일 username을 다른 유저가 쓰고 있는지 확인
-        for uid, info in registered_users.items():
-            if info["nickname"] == username and uid != discord_id:
-                await interaction.response.send_message(
-                    f"⚠️ `{username}`는 이미 다른 유저가 등록한 아이디입니다.",
-                    ephemeral=True
-                )
-                return
+        # 2. 동일 username을 다른 유저가 쓰고 있는지 확인 (닉네임 인덱스)
+        owner = await user_directory.find_by_nickname(username)
+        if owner and owner.discord_id != discord_id:
+            await interaction.response.send_message(
+                f"⚠️ `{username}`는 이미 다른 유저가 등록한 아이디입니다.",
+                ephemeral=True
+            )
+            return
 
         # 3. 닉네임 설정
         if interaction.guild.owner_id == interaction.user.id:
@@ -59,7 +59,7 @@ def setup_register_command(bot):
                 return
 
         # 4. Supabase에 등록/수정
-        register_user(discord_id, username, level, job.value)
+        await user_directory.register(discord_id, username, level, job.value)
 
-        action = "✅ 등록 완료" if discord_id not in registered_users else "🔄 정보 수정 완료"
+        action = "✅ 등록 완료" if not existing else "🔄 정보 수정 완료"
         await interaction.response.send_message(f"{action}: `{nickname}`", ephemeral=True)
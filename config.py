@@ -0,0 +1,89 @@
+import inspect
+import os
+
+
+class Settings:
+    """환경변수 설정. 값은 import 시점이 아니라 처음 읽을 때 해석한다."""
+
+    @property
+    def raid_announcement_channel_id(self) -> int | None:
+        value = os.getenv("RAID_ANNOUNCEMENT_CHANNEL_ID")
+        return int(value) if value else None
+
+    @property
+    def supabase_url(self) -> str | None:
+        return os.getenv("SUPABASE_URL")
+
+    @property
+    def supabase_key(self) -> str | None:
+        return os.getenv("SUPABASE_KEY")
+
+    @property
+    def notion_api_key(self) -> str | None:
+        return os.getenv("NOTION_API_KEY")
+
+    @property
+    def notion_db_id(self) -> str | None:
+        return os.getenv("NOTION_DISTRIBUTION_DB_ID") or os.getenv("NOTION_SETTLEMENT_DB_ID")
+
+    @property
+    def state_dir(self) -> str:
+        return os.getenv("BOT_STATE_DIR", ".state")
+
+
+settings = Settings()
+
+
+def _make_supabase():
+    from supabase_client import AsyncSupabase
+    return AsyncSupabase(settings.supabase_url, settings.supabase_key)
+
+
+def _make_notion():
+    from notion_client import Client
+    if not settings.notion_api_key or not settings.notion_db_id:
+        raise RuntimeError("Missing NOTION_API_KEY or NOTION_DB_ID")
+    return Client(auth=settings.notion_api_key)
+
+
+class Services:
+    """
+    외부 클라이언트 컨테이너. 처음 접근할 때 만들고 이후엔 재사용한다.
+    테스트/벤치마크는 override()로 가짜 클라이언트를 넣을 수 있다.
+    """
+
+    def __init__(self):
+        self._factories = {"supabase": _make_supabase, "notion": _make_notion}
+        self._instances = {}
+
+    def __getattr__(self, name: str):
+        factories = self.__dict__.get("_factories", {})
+        if name not in factories:
+            raise AttributeError(name)
+        instances = self.__dict__["_instances"]
+        if name not in instances:
+            instances[name] = factories[name]()
+        return instances[name]
+
+    def override(self, **instances):
+        self._instances.update(instances)
+
+    def reset(self, name: str | None = None):
+        if name is None:
+            self._instances.clear()
+        else:
+            self._instances.pop(name, None)
+
+    async def aclose(self):
+        """만들어진 클라이언트만 정리"""
+        for instance in self._instances.values():
+            close = getattr(instance, "close", None)
+            if close is None:
+                continue
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+        self._instances.clear()
+
+
+services = Services()
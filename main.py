@@ -1,20 +1,28 @@
+import time
+_BOOT_STARTED = time.perf_counter()  # 프로세스 시작 → on_ready 소요 시간 측정용
+
 import asyncio
+import hashlib
+import importlib
+import json
 import aiohttp
 from aiohttp import web
 import os
+import signal
+import traceback
 import discord
 from discord.ext import commands
 
-from supabase_storage import get_all_raids
-from commands.register import setup_register_command
-from commands.create_schedule import setup_create_raid_command
-from commands.reaction_handler import setup_reaction_handler
-from commands.edit_schedule import setup_edit_raid_command
-from commands.show_schdule import setup_show_raids_command
-from commands.delete_schedule import setup_delete_raid_command
-from commands.calculate_distribution import setup_distribution_command  # ← 추가
-
-from tasks import reminder
+from config import services, settings
+from raid_store import raid_store
+from tasks import reminder, dm_fanout, reconcile, roster_notifier
+from tasks.announcement_updater import announcement_updater
+from tasks.archiver import archiver
+from tasks.outbox import outbox
+from tasks.notion_sync import settlement_mirror
+from tasks.signup_engine import signup_engine
+from tasks.snapshot import snapshot
+from utils import metrics
 from views.raid_controls import RaidControlView
 
 # 디스코드 API에서 접근 허용 범위(Intents) 설정
@@ -22,14 +30,37 @@ intents = discord.Intents.default()
 intents.members = True
 bot = commands.Bot(command_prefix='.', intents=intents)
 
-# 명령어 파일에서 커맨드 등록
-setup_register_command(bot)
-setup_create_raid_command(bot)
-setup_reaction_handler(bot)
-setup_edit_raid_command(bot)
-setup_show_raids_command(bot)
-setup_delete_raid_command(bot)
-setup_distribution_command(bot)
+# 커맨드 트리 해시 저장 위치 (바뀌었을 때만 sync)
+COMMAND_HASH_PATH = os.path.join(settings.state_dir, "command_tree.sha256")
+
+# 재연결로 on_ready가 다시 불려도 초기화는 한 번만 (실패하면 다음 on_ready에서 다시 시도)
+_initialized = False
+_init_lock = asyncio.Lock()
+
+# 명령어 파일에서 커맨드 등록 (모듈별 import 시간 측정)
+COMMAND_MODULES = [
+    ("commands.register", "setup_register_command"),
+    ("commands.create_schedule", "setup_create_raid_command"),
+    ("commands.recurring_schedule", "setup_recurring_raid_command"),
+    ("commands.reaction_handler", "setup_reaction_handler"),
+    ("commands.edit_schedule", "setup_edit_raid_command"),
+    ("commands.show_schdule", "setup_show_raids_command"),
+    ("commands.delete_schedule", "setup_delete_raid_command"),
+    ("commands.calculate_distribution", "setup_distribution_command"),
+    ("commands.raid_history", "setup_raid_history_command"),
+    ("commands.reconcile_signups", "setup_reconcile_command"),
+]
+
+import_times = {}
+for module_name, setup_name in COMMAND_MODULES:
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    import_times[module_name] = time.perf_counter() - started
+    getattr(module, setup_name)(bot)
+
+for module_name, elapsed in sorted(import_times.items(), key=lambda x: x[1], reverse=True):
+    print(f"[import] {module_name}: {elapsed * 1000:.1f}ms")
+print(f"[import] total until commands registered: {(time.perf_counter() - _BOOT_STARTED) * 1000:.1f}ms")
 
 
 # health check endpoint
@@ -37,14 +68,20 @@ async def health_check(request):
     return web.Response(text="OK")
 
 
+# Prometheus scrape endpoint
+async def metrics_endpoint(request):
+    return web.Response(text=metrics.render(), content_type="text/plain", charset="utf-8")
+
+
 async def start_web_server():
     app = web.Application()
     app.router.add_get('/health', health_check)
+    app.router.add_get('/metrics', metrics_endpoint)
     runner = web.AppRunner(app)
     await runner.setup()
     site = web.TCPSite(runner, '0.0.0.0', 8000)
     await site.start()
-    print("✅ Health check server started at /health")
+    print("✅ Health check server started at /health, /metrics")
 
 
 async def ping_self():
@@ -59,28 +96,108 @@ async def ping_self():
         await asyncio.sleep(180)
 
 
-@bot.event
-async def on_ready():
-    print(f"🤖 Logged in as {bot.user}")
+def command_tree_hash() -> str:
+    payload = sorted((cmd.to_dict(bot.tree) for cmd in bot.tree.get_commands()), key=lambda c: c["name"])
+    payload = {"application_id": bot.application_id, "commands": payload}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+async def sync_commands_if_changed():
+    current = command_tree_hash()
+    try:
+        with open(COMMAND_HASH_PATH) as f:
+            previous = f.read().strip()
+    except OSError:
+        previous = None
+
+    if current == previous:
+        print("Slash commands unchanged, skip sync")
+        return
+
     await bot.tree.sync()
+    os.makedirs(settings.state_dir, exist_ok=True)
+    with open(COMMAND_HASH_PATH, "w") as f:
+        f.write(current)
     print("Slash commands synced!")
 
-    reminder.set_bot_instance(bot)
-    reminder.check_upcoming_raids.start()
 
-    # 기존 자쿰 일정에 대한 버튼 뷰 등록
-    raids = get_all_raids()
-    for raid in raids:
-        bot.add_view(RaidControlView(raid['id']))
-    print("✅ Raid views registered!")
+@bot.event
+async def on_app_command_completion(interaction: discord.Interaction, command):
+    metrics.commands_total.inc(command=command.qualified_name, result="ok")
+
+
+@bot.tree.error
+async def on_app_command_error(interaction: discord.Interaction, error):
+    name = interaction.command.qualified_name if interaction.command else "unknown"
+    metrics.commands_total.inc(command=name, result="error")
+    print(f"[command] {name} error: {error}")
+    # 기본 핸들러를 대체하므로 traceback은 직접 남긴다
+    traceback.print_exception(error)
+
+
+@bot.event
+async def on_ready():
+    global _initialized
+    print(f"🤖 Logged in as {bot.user}")
+    async with _init_lock:
+        if _initialized:
+            print("[on_ready] reconnected, skip initialization")
+            return
+        await initialize()
+        _initialized = True
+
+    print(f"⏱ Ready in {time.perf_counter() - _BOOT_STARTED:.2f}s")
+
+
+async def initialize():
+    # 명령어 동기화 실패는 기존 명령어로 계속 동작하므로 나머지 초기화는 진행 (해시를 안 남겨 다음 부팅 때 다시 sync)
+    try:
+        await sync_commands_if_changed()
+    except Exception as e:
+        print(f"[on_ready] slash command sync failed: {e}")
+        traceback.print_exc()
+
+    # 로컬 스냅샷이 있으면 바로 응답하고 저장소 재검증은 백그라운드로 (저장소 장애여도 조회 명령은 동작)
+    # 캐시를 못 채우면 여기서 예외 — 아래 작업은 아무것도 시작하지 않았으므로 다음 on_ready에서 처음부터 다시
+    warm = snapshot.restore()
+    if not warm:
+        await raid_store.load()
+
+    # 버튼 뷰는 메시지에서 일정을 찾으므로 하나만 등록
+    bot.add_view(RaidControlView())
+    print("✅ Raid view registered!")
+
+    dm_fanout.set_bot_instance(bot)
+    roster_notifier.start()
+    announcement_updater.start(bot)  # 공지 임베드 참여/대기 인원 실시간 갱신
+    snapshot.start(revalidate=warm)
+    outbox.start(bot)
+    reconcile.start(bot)  # 꺼져 있던 동안 놓친 ✅ 반응 보정
+    reminder.scheduler.start()
+    settlement_mirror.start()
+    archiver.start(bot)
 
 
 async def main():
-    await asyncio.gather(
-        start_web_server(),                     # 웹서버 실행
-        bot.start(os.getenv("DISCORD_TOKEN")),   # 디스코드 봇 실행
-        ping_self()
-    )
+    # 배포/재시작 때 플랫폼은 SIGTERM으로 종료 — 봇을 닫아 아래 finally(명단/스냅샷 저장)까지 가도록
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, lambda: asyncio.create_task(bot.close()))
+
+    background = [
+        asyncio.create_task(start_web_server()),        # 웹서버 실행
+        asyncio.create_task(ping_self()),
+        asyncio.create_task(metrics.monitor_loop_lag()),  # 이벤트 루프 지연 측정
+    ]
+    try:
+        await bot.start(os.getenv("DISCORD_TOKEN"))  # 디스코드 봇 실행 (닫히면 반환)
+    finally:
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        await signup_engine.flush_all()  # 대기 중인 명단 저장
+        if _initialized:
+            await snapshot.save()  # 다음 부팅은 이 상태로 바로 시작 (캐시를 못 채웠으면 이전 스냅샷 유지)
+        await services.aclose()  # 공유 커넥션 풀 등 클라이언트 정리
 
 
 if __name__ == "__main__":
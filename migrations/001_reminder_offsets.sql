@@ -0,0 +1,2 @@
+-- 일정별 알림 시점 (공대 시작 N분 전). NULL이면 기본값(REMINDER_OFFSETS_MINUTES) 사용
+alter table raids add column if not exists reminder_offsets integer[];
@@ -0,0 +1,8 @@
+-- 리마인더 발송 기록: 재시작 시 누락 알림 보충 + 중복 발송 방지
+create table if not exists reminder_deliveries (
+    raid_id text not null,
+    offset_minutes integer not null,
+    user_id text not null,
+    delivered_at timestamptz not null default now(),
+    primary key (raid_id, offset_minutes, user_id)
+);
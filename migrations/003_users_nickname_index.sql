@@ -0,0 +1,2 @@
+-- /공대원등록 닉네임 중복 확인용
+create index if not exists users_nickname_idx on users (nickname);
@@ -0,0 +1,8 @@
+-- raids.datetime을 timestamptz로 정규화 ("YYYY-MM-DD HH:MM" / ISO 혼용 제거)
+-- 기존 값은 타임존 없는 KST 시각이므로 Asia/Seoul 기준으로 변환
+alter table raids
+    alter column datetime type timestamptz
+    using (datetime::timestamp at time zone 'Asia/Seoul');
+
+-- 예정 일정 조회 (datetime >= now order by datetime limit n)
+create index if not exists raids_datetime_idx on raids (datetime);
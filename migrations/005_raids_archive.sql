@@ -0,0 +1,6 @@
+-- 끝난 일정 보관 테이블: raids와 같은 컬럼 + 보관 시각
+create table if not exists raids_archive (like raids including all);
+alter table raids_archive add column if not exists archived_at timestamptz not null default now();
+
+-- 지난 일정 조회 (order by datetime desc limit n)
+create index if not exists raids_archive_datetime_idx on raids_archive (datetime);
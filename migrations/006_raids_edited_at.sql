@@ -0,0 +1,3 @@
+-- 공지 임베드를 일정 상태만으로 다시 그릴 수 있도록 마지막 수정 시각을 저장
+alter table raids add column if not exists edited_at timestamptz;
+alter table raids_archive add column if not exists edited_at timestamptz;
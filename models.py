@@ -0,0 +1,203 @@
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import count
+
+from utils.datetime_util import parse_kst
+
+
+@dataclass(slots=True)
+class User:
+    """users 테이블 한 행 (discord_id는 정수로 보관)"""
+    discord_id: int
+    nickname: str
+    level: int
+    job: str
+
+    @classmethod
+    def from_row(cls, row: dict) -> "User":
+        return cls(
+            discord_id=int(row["discord_id"]),
+            nickname=row.get("nickname") or "",
+            level=int(row.get("level") or 0),
+            job=row.get("job") or "",
+        )
+
+
+@dataclass(slots=True)
+class RosterDiff:
+    """명단 변경 결과 — 알림/캐시 계층이 바뀐 사람만 처리할 수 있도록"""
+    added: list[int] = field(default_factory=list)       # 바로 참여 확정
+    waitlisted: list[int] = field(default_factory=list)  # 대기열에 추가
+    removed: list[int] = field(default_factory=list)     # 신청 취소
+    promoted: list[int] = field(default_factory=list)    # 대기 → 참여
+    demoted: list[int] = field(default_factory=list)     # 참여 → 대기 (정원 축소)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.waitlisted or self.removed or self.promoted or self.demoted)
+
+
+class Roster:
+    """
+    참여자 / 대기자 명단.
+    - 참여자: dict를 순서 있는 set으로 사용 (추가/삭제/포함 확인 O(1))
+    - 대기자: (ticket, id) deque + {id: ticket} 인덱스. 취소는 인덱스에서만 지우고
+      deque 항목은 꺼낼 때 ticket이 다르면 버린다 (lazy deletion)
+    """
+
+    __slots__ = ("capacity", "_participants", "_queue", "_waiting", "_tickets")
+
+    def __init__(self, capacity: int, participants=(), waitlist=()):
+        self.capacity = capacity
+        self._participants: dict[int, None] = dict.fromkeys(participants)
+        self._queue: deque[tuple[int, int]] = deque()
+        self._waiting: dict[int, int] = {}
+        self._tickets = count()
+        for uid in waitlist:
+            if uid not in self._participants and uid not in self._waiting:
+                self._enqueue(uid)
+
+    # ---------- 조회 ----------
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._participants or user_id in self._waiting
+
+    @property
+    def participants(self) -> list[int]:
+        return list(self._participants)
+
+    @property
+    def waitlist(self) -> list[int]:
+        return [uid for ticket, uid in self._queue if self._waiting.get(uid) == ticket]
+
+    @property
+    def participant_count(self) -> int:
+        return len(self._participants)
+
+    @property
+    def waitlist_count(self) -> int:
+        return len(self._waiting)
+
+    # ---------- 대기열 ----------
+    def _enqueue(self, user_id: int, front: bool = False):
+        ticket = next(self._tickets)
+        self._waiting[user_id] = ticket
+        if front:
+            self._queue.appendleft((ticket, user_id))
+        else:
+            self._queue.append((ticket, user_id))
+
+    def _pop_waiting(self) -> int | None:
+        while self._queue:
+            ticket, uid = self._queue.popleft()
+            if self._waiting.get(uid) == ticket:
+                del self._waiting[uid]
+                return uid
+        return None
+
+    def _compact(self):
+        # 취소로 쌓인 죽은 항목이 살아 있는 항목보다 많아지면 정리
+        if len(self._queue) > 2 * len(self._waiting) + 32:
+            self._queue = deque((t, uid) for t, uid in self._queue if self._waiting.get(uid) == t)
+
+    def _fill(self, diff: RosterDiff):
+        while len(self._participants) < self.capacity and self._waiting:
+            uid = self._pop_waiting()
+            self._participants[uid] = None
+            diff.promoted.append(uid)
+
+    # ---------- 변경 ----------
+    def join(self, user_id: int) -> RosterDiff:
+        diff = RosterDiff()
+        if user_id in self:
+            return diff  # 이미 신청됨
+        if len(self._participants) < self.capacity:
+            self._participants[user_id] = None
+            diff.added.append(user_id)
+        else:
+            self._enqueue(user_id)
+            diff.waitlisted.append(user_id)
+        return diff
+
+    def leave(self, user_id: int) -> RosterDiff:
+        diff = RosterDiff()
+        if user_id in self._participants:
+            del self._participants[user_id]
+            diff.removed.append(user_id)
+            self._fill(diff)
+        elif self._waiting.pop(user_id, None) is not None:
+            diff.removed.append(user_id)
+            self._compact()
+        return diff
+
+    def resize(self, capacity: int) -> RosterDiff:
+        """정원 변경: 늘면 대기자 승격, 줄면 마지막 참여자부터 대기열 맨 앞으로"""
+        diff = RosterDiff()
+        self.capacity = capacity
+        while len(self._participants) > capacity:
+            uid, _ = self._participants.popitem()
+            self._enqueue(uid, front=True)
+            diff.demoted.append(uid)
+        diff.demoted.reverse()
+        self._fill(diff)
+        return diff
+
+
+@dataclass(slots=True)
+class Raid:
+    """
+    raids 테이블 한 행. 시각은 로드할 때 한 번만 KST aware datetime으로 파싱하고,
+    명단은 Roster(정수 id)로 들고 있다.
+    """
+    id: str
+    starts_at: datetime
+    roster: Roster
+    note: str = ""
+    reminder_offsets: list[int] | None = None
+    message_id: int | None = None
+    edited_at: datetime | None = None  # /일정수정 으로 마지막 수정된 시각
+
+    @property
+    def key(self) -> str:
+        """"YYYY-MM-DD HH:MM" (KST) — 일정 식별/표시용"""
+        return self.starts_at.strftime("%Y-%m-%d %H:%M")
+
+    @property
+    def max_participants(self) -> int:
+        return self.roster.capacity
+
+    @property
+    def participants(self) -> list[int]:
+        return self.roster.participants
+
+    @property
+    def waitlist(self) -> list[int]:
+        return self.roster.waitlist
+
+    @classmethod
+    def from_row(cls, row: dict) -> "Raid":
+        return cls(
+            id=str(row["id"]),
+            starts_at=parse_kst(row["datetime"]),
+            roster=Roster(
+                int(row.get("max_participants") or 0),
+                [int(uid) for uid in row.get("participants") or []],
+                [int(uid) for uid in row.get("waitlist") or []],
+            ),
+            note=row.get("note") or "",
+            reminder_offsets=row.get("reminder_offsets"),
+            message_id=int(row["message_id"]) if row.get("message_id") else None,
+            edited_at=parse_kst(row["edited_at"]) if row.get("edited_at") else None,
+        )
+
+    def to_row(self) -> dict:
+        return {
+            "id": self.id,
+            "datetime": self.starts_at.isoformat(timespec="seconds"),
+            "max_participants": self.max_participants,
+            "note": self.note,
+            "participants": [str(uid) for uid in self.participants],
+            "waitlist": [str(uid) for uid in self.waitlist],
+            "reminder_offsets": self.reminder_offsets,
+            "message_id": self.message_id,
+            "edited_at": self.edited_at.isoformat(timespec="seconds") if self.edited_at else None,
+        }
@@ -0,0 +1,98 @@
+import asyncio
+from datetime import date, datetime
+
+from config import services, settings
+from utils.metrics import notion_latency, timed
+
+
+def _num(prop):
+    if not isinstance(prop, dict):
+        return None
+    t = prop.get("type")
+
+    # 기본 number
+    if t == "number":
+        return prop.get("number")
+
+    # formula(number)
+    if t == "formula":
+        f = prop.get("formula") or {}
+        if f.get("type") == "number":
+            return f.get("number")
+
+    # rollup(number)
+    if t == "rollup":
+        r = prop.get("rollup") or {}
+        if r.get("type") == "number":
+            return r.get("number")
+
+
+def _date_prop(prop):  # date -> datetime.date
+    try:
+        s = (prop or {}).get("date", {}).get("start")
+        return datetime.fromisoformat(s).date() if s else None
+    except Exception:
+        return None
+
+
+def _text(prop):  # title/rich_text -> str
+    arr = (prop or {}).get("title") or (prop or {}).get("rich_text") or []
+    return "".join(x.get("plain_text", "") for x in arr) if arr else ""
+
+
+def _extract(page):
+    props = page.get("properties", {}) if isinstance(page, dict) else {}
+    status = (props.get("정산진행 여부", {}).get("status") or {}).get("name", "")
+    total = _num(props.get("총 수익"))
+    participants = _num(props.get("참여자 수"))
+    per_person = _num(props.get("인당 분배금"))
+    if per_person is None and (total is not None) and (participants and participants > 0):
+        per_person = total / participants
+
+    return {
+        "id": page.get("id"),
+        "last_edited_time": page.get("last_edited_time"),
+        "date": _date_prop(props.get("날짜")),
+        "title": _text(props.get("정산 세부 페이지")),
+        "status": status or "-",
+        "participants": participants or 0,
+        "total": total or 0,
+        "per_person": int(per_person or 0),
+        "url": page.get("url"),
+    }
+
+
+# 동기 Notion 호출 (호출하는 쪽에서 스레드로 오프로딩)
+@timed(notion_latency)
+def query_pages_blocking(filter=None, sorts=None, start_cursor=None, page_size: int = 100):
+    """한 페이지 조회. (results, next_cursor) 반환 — next_cursor가 None이면 마지막 페이지"""
+    kwargs = {"database_id": settings.notion_db_id, "page_size": page_size}
+    if filter:
+        kwargs["filter"] = filter
+    if sorts:
+        kwargs["sorts"] = sorts
+    if start_cursor:
+        kwargs["start_cursor"] = start_cursor
+    res = services.notion.databases.query(**kwargs)
+    next_cursor = res.get("next_cursor") if res.get("has_more") else None
+    return res.get("results", []), next_cursor
+
+
+async def iter_pages(filter=None, sorts=None, page_size: int = 100):
+    """커서를 따라 모든 페이지를 한 장씩 흘려보내는 async generator (호출은 스레드로 오프로딩)"""
+    cursor = None
+    while True:
+        pages, cursor = await asyncio.to_thread(query_pages_blocking, filter, sorts, cursor, page_size)
+        yield pages
+        if not cursor:
+            return
+
+
+def date_range_filter(start: date, end: date) -> dict:
+    """날짜 속성 기준 [start, end) 필터"""
+    return {
+        "and": [
+            {"property": "날짜", "date": {"on_or_after": start.isoformat()}},
+            {"property": "날짜", "date": {"before": end.isoformat()}},
+        ]
+    }
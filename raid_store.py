@@ -0,0 +1,331 @@
+import asyncio
+import os
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+
+import supabase_storage as storage
+from models import Raid, RosterDiff
+from tasks.delivery_ledger import ledger
+from utils.datetime_util import KST, parse_kst, to_key
+from utils.metrics import cache_hit
+
+# 로드 시 이만큼 지난 일정까지 캐시 (리마인더 catch-up / 끝난 직후 버튼 클릭용)
+CACHE_HORIZON = timedelta(hours=float(os.getenv("RAID_CACHE_HORIZON_HOURS", "24")))
+
+
+class RaidStore:
+    """
+    raids 테이블의 프로세스 전역 캐시.
+    최초 1회 예정 일정(+ CACHE_HORIZON 만큼 지난 일정)만 로드하고,
+    이후 조회는 id / message_id / 일정 키 인덱스로 O(1), 시간순 목록은 정렬 인덱스로 처리.
+    쓰기는 Supabase에 먼저 반영(write-through)한 뒤 캐시를 갱신한다.
+    """
+
+    def __init__(self):
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+        self._by_id: dict[str, Raid] = {}
+        self._by_message_id: dict[int, Raid] = {}
+        self._by_key: dict[str, Raid] = {}
+        self._sorted: list[tuple[datetime, str]] = []  # (일정 시각, id) 오름차순
+        self._missing_message_ids: set[int] = set()  # 저장소에도 없던 message_id (반복 조회 방지)
+        self._versions: dict[str, int] = {}  # 일정별 변경 버전 (렌더링 캐시 키)
+        self._generation = 0  # 어느 일정이든 추가/변경/삭제되면 증가 (목록 렌더링 캐시 키)
+        self._listeners = []
+        self._roster_listeners = []
+        self._fresh = asyncio.Event()  # 저장소에서 한 번이라도 로드했는지 (스냅샷만으로 떠 있으면 미설정)
+
+    # ---------- 변경 알림 ----------
+    def add_listener(self, callback):
+        """callback(event, raid) — event는 "load" / "upsert" / "delete" (load면 raid=None)"""
+        self._listeners.append(callback)
+
+    def add_roster_listener(self, callback):
+        """callback(raid, diff) — 명단이 실제로 바뀐 경우에만 (RosterDiff)"""
+        self._roster_listeners.append(callback)
+
+    def _notify_roster(self, raid: Raid, diff: RosterDiff) -> RosterDiff:
+        if diff:
+            self._bump(raid.id)
+            for callback in self._roster_listeners:
+                try:
+                    callback(raid, diff)
+                except Exception as e:
+                    print(f"[raid_store] roster listener error: {e}")
+        return diff
+
+    def _notify(self, event: str, raid: Raid | None):
+        for callback in self._listeners:
+            try:
+                callback(event, raid)
+            except Exception as e:
+                print(f"[raid_store] listener error ({event}): {e}")
+
+    # ---------- 로드 / 인덱스 ----------
+    async def load(self, force: bool = False):
+        if self._loaded and not force:
+            return
+        async with self._load_lock:
+            if self._loaded and not force:
+                return
+            raids = await storage.get_upcoming_raids(datetime.now(KST) - CACHE_HORIZON)
+            self._by_id.clear()
+            self._by_message_id.clear()
+            self._by_key.clear()
+            self._sorted.clear()
+            self._missing_message_ids.clear()
+            for raid in raids:
+                self._index(raid)
+            self._loaded = True
+            self._fresh.set()
+            print(f"[raid_store] loaded {len(raids)} raids")
+        self._notify("load", None)
+
+    @property
+    def fresh(self) -> bool:
+        """저장소 기준 데이터인지 (False면 스냅샷만으로 떠 있는 상태 — 명단 저장 금지)"""
+        return self._fresh.is_set()
+
+    async def wait_fresh(self):
+        """저장소 기준으로 로드될 때까지 대기 (스냅샷으로 시작한 경우 재검증 완료까지)"""
+        await self._fresh.wait()
+
+    # ---------- 스냅샷 ----------
+    def snapshot(self) -> list[dict]:
+        return [raid.to_row() for raid in self._by_id.values()]
+
+    def restore(self, rows: list[dict]) -> int:
+        """디스크 스냅샷으로 캐시를 채운다. 이후 load(force=True)로 저장소와 다시 맞출 때까지 이걸로 응답"""
+        if self._loaded:
+            return 0
+        horizon = datetime.now(KST) - CACHE_HORIZON
+        for raid in map(Raid.from_row, rows):
+            if raid.starts_at >= horizon:
+                self._index(raid)
+        self._loaded = True
+        print(f"[raid_store] restored {len(self._by_id)} raids from snapshot")
+        self._notify("load", None)
+        return len(self._by_id)
+
+    def _bump(self, raid_id: str):
+        self._versions[raid_id] = self._versions.get(raid_id, 0) + 1
+        self._generation += 1
+
+    def version(self, raid_id: str) -> int:
+        """일정 정보나 명단이 바뀔 때마다 증가"""
+        return self._versions.get(raid_id, 0)
+
+    @property
+    def generation(self) -> int:
+        """일정 목록 전체의 버전"""
+        return self._generation
+
+    def _index(self, raid: Raid):
+        self._bump(raid.id)
+        self._by_id[raid.id] = raid
+        if raid.message_id:
+            self._by_message_id[raid.message_id] = raid
+        self._by_key[raid.key] = raid
+        insort(self._sorted, (raid.starts_at, raid.id))
+
+    def _unindex(self, raid: Raid):
+        self._generation += 1
+        self._by_id.pop(raid.id, None)
+        if raid.message_id:
+            self._by_message_id.pop(raid.message_id, None)
+        self._by_key.pop(raid.key, None)
+        entry = (raid.starts_at, raid.id)
+        i = bisect_left(self._sorted, entry)
+        if i < len(self._sorted) and self._sorted[i] == entry:
+            del self._sorted[i]
+
+    # ---------- 조회 (캐시 우선, 최초 1회만 로드 대기) ----------
+    async def all(self) -> list[Raid]:
+        await self.load()
+        return list(self._by_id.values())
+
+    async def upcoming(self, now: datetime | None = None, limit: int | None = None, offset: int = 0) -> list[Raid]:
+        """now 이후 일정을 시간순으로 (정렬 인덱스에서 잘라서 반환)"""
+        await self.load()
+        start = bisect_left(self._sorted, (now or datetime.now(KST),)) + offset
+        end = start + limit if limit else None
+        return [self._by_id[raid_id] for _, raid_id in self._sorted[start:end]]
+
+    async def count_upcoming(self, now: datetime | None = None) -> int:
+        await self.load()
+        return len(self._sorted) - bisect_left(self._sorted, (now or datetime.now(KST),))
+
+    def search(self, query: str, now: datetime | None = None, limit: int = 25) -> list[Raid]:
+        """
+        자동완성용 예정 일정 검색 — 로드 대기 / 저장소 조회 없이 현재 캐시만 본다.
+        일정 키 접두어 일치를 시간순으로 먼저, 남은 자리는 키 / 특이사항 부분 일치로 채운다.
+        키("YYYY-MM-DD HH:MM")는 시간순과 사전순이 같아서 접두어 범위는 정렬 인덱스에서 이분 탐색.
+        """
+        start = bisect_left(self._sorted, (now or datetime.now(KST),))
+        query = query.strip().casefold()
+        if not query:
+            return [self._by_id[raid_id] for _, raid_id in self._sorted[start:start + limit]]
+
+        i = max(start, bisect_left(self._sorted, query, key=lambda entry: self._by_id[entry[1]].key))
+        matches = []
+        while i < len(self._sorted) and len(matches) < limit:
+            raid = self._by_id[self._sorted[i][1]]
+            if not raid.key.startswith(query):
+                break
+            matches.append(raid)
+            i += 1
+
+        if len(matches) < limit:
+            prefixed = {raid.id for raid in matches}
+            for _, raid_id in self._sorted[start:]:
+                raid = self._by_id[raid_id]
+                if raid_id not in prefixed and (query in raid.key or query in raid.note.casefold()):
+                    matches.append(raid)
+                    if len(matches) >= limit:
+                        break
+        return matches
+
+    def cached(self) -> list[Raid]:
+        """로드 대기 없이 현재 캐시 그대로 반환 (동기 콜백용)"""
+        return list(self._by_id.values())
+
+    async def get(self, raid_id: str) -> Raid | None:
+        await self.load()
+        return self._by_id.get(raid_id)
+
+    async def get_by_message_id(self, message_id: int) -> Raid | None:
+        await self.load()
+        message_id = int(message_id)
+        raid = self._by_message_id.get(message_id)
+        cache_hit("raid_store", raid is not None)
+        if raid is None and message_id not in self._missing_message_ids:
+            # 캐시 범위 밖(오래전) 일정의 공지일 수 있으니 저장소에서 한 번 더 확인
+            raid = await storage.get_raid_by_message_id(message_id)
+            if raid:
+                self._index(raid)
+            else:
+                self._missing_message_ids.add(message_id)
+        return raid
+
+    async def get_by_key(self, key: str) -> Raid | None:
+        """key는 "YYYY-MM-DD HH:MM" 또는 ISO 형식 모두 허용 (캐시 범위 안의 일정만)"""
+        await self.load()
+        try:
+            raid = self._by_key.get(to_key(key))
+        except ValueError:
+            raid = None  # 자동완성 대신 직접 입력한 날짜가 아닌 문자열
+        cache_hit("raid_store", raid is not None)
+        return raid
+
+    # ---------- 쓰기 (write-through) ----------
+    async def create_raid(self, datetime_str: str, max_participants: int, note: str,
+                          reminder_offsets: list[int] | None = None) -> str:
+        raid = await storage.create_raid(datetime_str, max_participants, note, reminder_offsets)
+        self._index(raid)
+        self._notify("upsert", raid)
+        return raid.id
+
+    async def create_raids(self, datetime_strs: list[str], max_participants: int, note: str,
+                           reminder_offsets: list[int] | None = None) -> list[Raid]:
+        """반복 일정 일괄 생성 (insert 한 번)"""
+        raids = await storage.create_raids(datetime_strs, max_participants, note, reminder_offsets)
+        for raid in raids:
+            self._index(raid)
+            self._notify("upsert", raid)
+        return raids
+
+    async def set_message_id(self, raid_id: str, message_id: int):
+        """
+        캐시를 먼저 연결한 뒤 저장한다 — 저장 전에 눌린 ✅도 일정을 찾고,
+        저장이 실패해 재시도하더라도 이미 공지한 일정은 다시 공지하지 않게.
+        """
+        self.attach_message_id(raid_id, message_id)
+        await storage.update_raid_message_id(raid_id, message_id)
+
+    def _ensure_fresh(self):
+        # 스냅샷 명단은 최대 SNAPSHOT_INTERVAL 이상 오래됐을 수 있어 저장소에 덮어쓰면 그 뒤 신청이 사라진다
+        if not self.fresh:
+            raise RuntimeError("저장소 재검증 전에는 명단을 저장하지 않습니다 (스냅샷 상태)")
+
+    def attach_message_id(self, raid_id: str, message_id: int):
+        """캐시에만 공지 message_id 연결 (저장은 persist_message_ids로 모아서)"""
+        raid = self._by_id.get(raid_id)
+        if raid:
+            raid.message_id = int(message_id)
+            self._by_message_id[raid.message_id] = raid
+        self._missing_message_ids.discard(int(message_id))
+
+    async def persist_message_ids(self, raid_ids: list[str]):
+        """캐시에 연결된 message_id만 모아서 저장 (캐시에서 빠진 = 삭제/보관된 일정은 건너뜀)"""
+        raids = [self._by_id[raid_id] for raid_id in raid_ids if raid_id in self._by_id]
+        await storage.update_raid_message_ids({raid.id: raid.message_id for raid in raids if raid.message_id})
+
+    async def update_raid(self, raid_id: str, new_datetime: str, max_participants: int, note: str,
+                          reminder_offsets: list[int] | None = None) -> RosterDiff:
+        """정원이 바뀌어 승격/강등된 사람이 있으면 명단까지 저장하고 그 diff를 반환"""
+        self._ensure_fresh()
+        edited_at = datetime.now(KST).replace(microsecond=0)
+        await storage.update_raid(raid_id, new_datetime, max_participants, note, reminder_offsets, edited_at)
+        raid = self._by_id.get(raid_id)
+        if not raid:
+            return RosterDiff()
+        starts_at = parse_kst(new_datetime)
+        if starts_at != raid.starts_at:
+            # 발송 기록은 (일정, offset, 유저) 기준이라 시각이 바뀌면 새 시각의 알림이 빠지지 않도록 비운다
+            await storage.delete_reminder_deliveries([raid_id])
+            ledger.forget(raid_id)
+        self._unindex(raid)
+        raid.starts_at = starts_at
+        raid.note = note
+        raid.reminder_offsets = reminder_offsets
+        raid.edited_at = edited_at
+        self._index(raid)
+        self._notify("upsert", raid)
+
+        diff = self._notify_roster(raid, raid.roster.resize(max_participants))
+        if diff:
+            await self.persist_roster(raid_id)
+        return diff
+
+    def forget(self, raid_ids: list[str]):
+        """보관 처리된 일정을 캐시에서 제거 (저장소는 이미 반영된 상태)"""
+        for raid_id in raid_ids:
+            raid = self._by_id.get(raid_id)
+            if raid:
+                self._unindex(raid)
+                self._versions.pop(raid_id, None)
+                self._notify("delete", raid)
+
+    def join(self, raid: Raid, user_id: int) -> RosterDiff:
+        """캐시 명단만 갱신 (저장은 persist_roster로 따로)"""
+        return self._notify_roster(raid, raid.roster.join(user_id))
+
+    def leave(self, raid: Raid, user_id: int) -> RosterDiff:
+        """캐시 명단만 갱신 (저장은 persist_roster로 따로)"""
+        return self._notify_roster(raid, raid.roster.leave(user_id))
+
+    async def persist_roster(self, raid_id: str):
+        """캐시에 있는 현재 명단을 그대로 저장"""
+        self._ensure_fresh()
+        raid = self._by_id.get(raid_id)
+        if raid:
+            await storage.update_raid_participants(raid_id, raid.participants, raid.waitlist)
+
+    async def delete_raid_by_key(self, key: str):
+        # 캐시에서 먼저 빼야 삭제 저장 중에 공지/message_id 저장이 이 일정을 다시 건드리지 않는다
+        raid = self._by_key.get(to_key(key))
+        if raid:
+            self._unindex(raid)
+            self._notify("delete", raid)
+        try:
+            await storage.delete_raid_by_key(key)
+        except Exception:
+            if raid:
+                self._index(raid)
+                self._notify("upsert", raid)
+            raise
+        if raid:
+            self._versions.pop(raid.id, None)
+
+
+raid_store = RaidStore()
@@ -1,7 +1,144 @@
-from supabase import create_client, Client
+import asyncio
+import json
 import os
 
-url = os.getenv("SUPABASE_URL")
-key = os.getenv("SUPABASE_KEY")
+import aiohttp
+
+# 커넥션 풀 / 동시 요청 수 / 타임아웃 (환경변수로 조절)
+POOL_SIZE = int(os.getenv("SUPABASE_POOL_SIZE", "20"))
+MAX_CONCURRENCY = int(os.getenv("SUPABASE_MAX_CONCURRENCY", "10"))
+TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "10"))
+KEEPALIVE = float(os.getenv("SUPABASE_KEEPALIVE", "60"))
+
+
+class SupabaseError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Supabase {status}: {message}")
+        self.status = status
+        self.message = message
+
+
+class APIResponse:
+    def __init__(self, data: list):
+        self.data = data
+
+
+class _Query:
+    """supabase-py 빌더와 같은 모양의 PostgREST 쿼리 빌더 (execute만 await)"""
+
+    def __init__(self, client: "AsyncSupabase", table: str):
+        self._client = client
+        self._table = table
+        self._method = "GET"
+        self._params: list[tuple[str, str]] = []
+        self._body = None
+        self._prefer: list[str] = []
+
+    # ---------- 동작 ----------
+    def select(self, columns: str = "*"):
+        self._method = "GET"
+        self._params.append(("select", columns))
+        return self
+
+    def insert(self, data):
+        self._method = "POST"
+        self._body = data
+        self._prefer.append("return=representation")
+        return self
+
+    def upsert(self, data, on_conflict=None):
+        self._method = "POST"
+        self._body = data
+        self._prefer += ["resolution=merge-duplicates", "return=representation"]
+        if on_conflict:
+            cols = on_conflict if isinstance(on_conflict, str) else ",".join(on_conflict)
+            self._params.append(("on_conflict", cols))
+        return self
+
+    def update(self, data: dict):
+        self._method = "PATCH"
+        self._body = data
+        return self
+
+    def delete(self):
+        self._method = "DELETE"
+        return self
+
+    # ---------- 필터 ----------
+    def eq(self, column: str, value):
+        self._params.append((column, f"eq.{value}"))
+        return self
+
+    def gte(self, column: str, value):
+        self._params.append((column, f"gte.{value}"))
+        return self
+
+    def lt(self, column: str, value):
+        self._params.append((column, f"lt.{value}"))
+        return self
+
+    def order(self, column: str, desc: bool = False):
+        self._params.append(("order", f"{column}.{'desc' if desc else 'asc'}"))
+        return self
+
+    def limit(self, count: int):
+        self._params.append(("limit", str(count)))
+        return self
+
+    def in_(self, column: str, values):
+        joined = ",".join(f'"{v}"' for v in values)
+        self._params.append((column, f"in.({joined})"))
+        return self
+
+    async def execute(self) -> APIResponse:
+        data = await self._client.request(self._method, self._table, self._params, self._body, self._prefer)
+        return APIResponse(data if isinstance(data, list) else [])
+
+
+class AsyncSupabase:
+    """
+    공유 keep-alive 커넥션 풀 하나로 PostgREST를 호출하는 비동기 클라이언트.
+    세션은 첫 요청 시 (이벤트 루프 안에서) 생성된다.
+    """
+
+    def __init__(self, url: str, key: str, pool_size: int = POOL_SIZE,
+                 max_concurrency: int = MAX_CONCURRENCY, timeout: float = TIMEOUT):
+        self.rest_url = f"{(url or '').rstrip('/')}/rest/v1"
+        self._key = key
+        self._pool_size = pool_size
+        self._timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session: aiohttp.ClientSession | None = None
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self._pool_size, keepalive_timeout=KEEPALIVE)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self._timeout),
+                headers={
+                    "apikey": self._key or "",
+                    "Authorization": f"Bearer {self._key or ''}",
+                },
+            )
+        return self._session
+
+    async def request(self, method: str, table: str, params=None, body=None, prefer=None):
+        headers = {"Prefer": ",".join(prefer)} if prefer else {}
+        async with self._semaphore:
+            session = self._get_session()
+            async with session.request(
+                method, f"{self.rest_url}/{table}", params=params or [], json=body, headers=headers
+            ) as resp:
+                text = await resp.text()
+                if resp.status >= 400:
+                    raise SupabaseError(resp.status, text)
+                return json.loads(text) if text else []
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
 
-supabase: Client = create_client(url, key)
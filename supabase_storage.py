@@ -1,77 +1,217 @@
-from supabase_client import supabase
+import asyncio
+from datetime import datetime
+
+from config import services
+from models import Raid, User
+from utils.datetime_util import to_timestamptz
+from utils.metrics import storage_latency, timed
+
+# in 필터 URL 길이 제한을 피하기 위한 조회 단위 (id 목록 조회는 호출하는 쪽에서 이 크기로 나눠 부른다)
+IN_CHUNK = 100
 
 
 # 유저 등록 / 조회
-def register_user(discord_id: str, nickname: str, level: int, job: str):
+@timed(storage_latency)
+async def register_user(discord_id: int, nickname: str, level: int, job: str):
     data = {
-        "discord_id": discord_id,
+        "discord_id": str(discord_id),
         "nickname": nickname,
         "level": level,
         "job": job
     }
     print(data)
-    return supabase.table("users").upsert(data, on_conflict=["discord_id"]).execute()
+    return await services.supabase.table("users").upsert(data, on_conflict=["discord_id"]).execute()
+
+
+@timed(storage_latency)
+async def get_user(discord_id: int) -> User | None:
+    result = await services.supabase.table("users").select("*").eq("discord_id", str(discord_id)).execute()
+    return User.from_row(result.data[0]) if result.data else None
+
 
+@timed(storage_latency)
+async def get_users(discord_ids: list[int]) -> list[User]:
+    if not discord_ids:
+        return []
+    result = await services.supabase.table("users").select("*").in_("discord_id", [str(i) for i in discord_ids]).execute()
+    return [User.from_row(row) for row in result.data]
 
-def get_user(discord_id: str):
-    result = supabase.table("users").select("*").eq("discord_id", discord_id).execute()
-    return result.data[0] if result.data else None
+
+@timed(storage_latency)
+async def get_user_by_nickname(nickname: str) -> User | None:
+    result = await services.supabase.table("users").select("*").eq("nickname", nickname).execute()
+    return User.from_row(result.data[0]) if result.data else None
 
 
 # 공대 일정 생성 / 전체 조회
-def create_raid(datetime_str: str, max_participants: int, note: str):
+@timed(storage_latency)
+async def create_raid(datetime_str: str, max_participants: int, note: str, reminder_offsets: list | None = None) -> Raid:
     from uuid import uuid4
     new_id = str(uuid4())
     data = {
         "id": new_id,
-        "datetime": datetime_str,
+        "datetime": to_timestamptz(datetime_str),
         "max_participants": max_participants,
         "note": note,
         "participants": [],
-        "waitlist": []
+        "waitlist": [],
+        "reminder_offsets": reminder_offsets
     }
-    response = supabase.table("raids").insert(data).execute()
+    response = await services.supabase.table("raids").insert(data).execute()
     print("📦 Insert Response:", response.data)
-    return new_id
+    return Raid.from_row(response.data[0] if response.data else data)
+
+
+@timed(storage_latency)
+async def create_raids(datetime_strs: list[str], max_participants: int, note: str,
+                       reminder_offsets: list | None = None) -> list[Raid]:
+    # 반복 일정: 같은 설정의 여러 일정을 insert 한 번으로
+    from uuid import uuid4
+    rows = [{
+        "id": str(uuid4()),
+        "datetime": to_timestamptz(datetime_str),
+        "max_participants": max_participants,
+        "note": note,
+        "participants": [],
+        "waitlist": [],
+        "reminder_offsets": reminder_offsets
+    } for datetime_str in datetime_strs]
+    if not rows:
+        return []
+    response = await services.supabase.table("raids").insert(rows).execute()
+    return [Raid.from_row(row) for row in response.data or rows]
+
+
+@timed(storage_latency)
+async def get_all_raids() -> list[Raid]:
+    result = await services.supabase.table("raids").select("*").execute()
+    return [Raid.from_row(row) for row in result.data or []]
+
+
+@timed(storage_latency)
+async def get_upcoming_raids(since: datetime, limit: int | None = None) -> list[Raid]:
+    # datetime 인덱스를 타는 범위 조회 (정렬/개수 제한도 서버에서)
+    query = services.supabase.table("raids").select("*").gte("datetime", since.isoformat()).order("datetime")
+    if limit:
+        query = query.limit(limit)
+    result = await query.execute()
+    return [Raid.from_row(row) for row in result.data]
+
+
+@timed(storage_latency)
+async def get_raids_between(start: datetime, end: datetime) -> list[Raid]:
+    # [start, end) 범위 조회 (datetime 인덱스) — 여러 일정의 중복 확인을 한 번에
+    result = await services.supabase.table("raids").select("*").gte("datetime", start.isoformat()).lt("datetime", end.isoformat()).order("datetime").execute()
+    return [Raid.from_row(row) for row in result.data]
 
 
-def get_all_raids():
-    result = supabase.table("raids").select("*").execute()
-    return result.data if result.data else []
+@timed(storage_latency)
+async def get_raids_before(cutoff: datetime, limit: int) -> list[Raid]:
+    # 보관 대상: cutoff 이전에 시작한 일정 (오래된 순)
+    result = await services.supabase.table("raids").select("*").lt("datetime", cutoff.isoformat()).order("datetime").limit(limit).execute()
+    return [Raid.from_row(row) for row in result.data]
 
 
-def get_raid_by_key(key: str):
-    # key는 "YYYY-MM-DD HH:MM" 형식의 문자열
-    result = supabase.table("raids").select("*").eq("datetime", key).execute()
-    return result.data[0] if result.data else None
+@timed(storage_latency)
+async def get_raid_by_key(key: str) -> Raid | None:
+    # key는 "YYYY-MM-DD HH:MM" 또는 ISO 형식의 문자열
+    result = await services.supabase.table("raids").select("*").eq("datetime", to_timestamptz(key)).execute()
+    return Raid.from_row(result.data[0]) if result.data else None
 
 
-def delete_raid_by_key(key: str):
-    supabase.table("raids").delete().eq("datetime", key).execute()
+@timed(storage_latency)
+async def delete_raid_by_key(key: str):
+    await services.supabase.table("raids").delete().eq("datetime", to_timestamptz(key)).execute()
 
 
-def update_raid(raid_id: str, new_datetime: str, max_participants: int, note: str):
-    supabase.table("raids").update({
-        "datetime": new_datetime,
+@timed(storage_latency)
+async def delete_raids(raid_ids: list):
+    if raid_ids:
+        await services.supabase.table("raids").delete().in_("id", raid_ids).execute()
+
+
+@timed(storage_latency)
+async def update_raid(raid_id: str, new_datetime: str, max_participants: int, note: str,
+                      reminder_offsets: list | None = None, edited_at: datetime | None = None):
+    await services.supabase.table("raids").update({
+        "datetime": to_timestamptz(new_datetime),
         "max_participants": max_participants,
-        "note": note
+        "note": note,
+        "reminder_offsets": reminder_offsets,
+        "edited_at": edited_at.isoformat(timespec="seconds") if edited_at else None
     }).eq("id", raid_id).execute()
 
 
-def get_raid_by_message_id(message_id: int):
-    result = supabase.table("raids").select("*").eq("message_id", message_id).execute()
+@timed(storage_latency)
+async def update_raid_message_id(raid_id: str, message_id: int):
+    await services.supabase.table("raids").update({"message_id": message_id}).eq("id", raid_id).execute()
+
+
+@timed(storage_latency)
+async def update_raid_message_ids(message_ids: dict[str, int]):
+    # 행마다 값이 다르므로 id별 update를 동시에 — 전체 행 upsert와 달리 그 사이 삭제된 일정은 되살리지 않고 건너뛴다
+    await asyncio.gather(*(
+        services.supabase.table("raids").update({"message_id": message_id}).eq("id", raid_id).execute()
+        for raid_id, message_id in message_ids.items()
+    ))
+
+
+@timed(storage_latency)
+async def get_raid_by_message_id(message_id: int) -> Raid | None:
+    result = await services.supabase.table("raids").select("*").eq("message_id", message_id).execute()
     if result.data:
-        return result.data[0]
+        return Raid.from_row(result.data[0])
     return None
 
 
-def update_raid_participants(raid_id: int, participants: list, waitlist: list):
-    supabase.table("raids").update({
-        "participants": participants,
-        "waitlist": waitlist
+@timed(storage_latency)
+async def update_raid_participants(raid_id: str, participants: list[int], waitlist: list[int]):
+    await services.supabase.table("raids").update({
+        "participants": [str(uid) for uid in participants],
+        "waitlist": [str(uid) for uid in waitlist]
     }).eq("id", raid_id).execute()
 
 
-def get_all_users():
-    result = supabase.table("users").select("*").execute()
-    return {str(user["discord_id"]): user for user in result.data}
\ No newline at end of file
+@timed(storage_latency)
+async def get_all_users() -> dict[int, User]:
+    result = await services.supabase.table("users").select("*").execute()
+    return {user.discord_id: user for user in map(User.from_row, result.data)}
+
+
+# 리마인더 발송 기록 (raid_id, offset_minutes, user_id)
+@timed(storage_latency)
+async def get_reminder_deliveries(raid_ids: list):
+    if not raid_ids:
+        return []
+    result = await services.supabase.table("reminder_deliveries").select("raid_id,offset_minutes,user_id").in_("raid_id", raid_ids).execute()
+    return result.data
+
+
+@timed(storage_latency)
+async def record_reminder_deliveries(rows: list):
+    if rows:
+        await services.supabase.table("reminder_deliveries").upsert(rows, on_conflict=["raid_id", "offset_minutes", "user_id"]).execute()
+
+
+@timed(storage_latency)
+async def delete_reminder_deliveries(raid_ids: list):
+    if raid_ids:
+        await services.supabase.table("reminder_deliveries").delete().in_("raid_id", raid_ids).execute()
+
+
+# 지난 일정 보관함 (raids_archive)
+@timed(storage_latency)
+async def archive_raids(raids: list[Raid]):
+    # id 기준 upsert라 중간에 실패해 다시 옮겨도 중복되지 않는다
+    if raids:
+        await services.supabase.table("raids_archive").upsert([raid.to_row() for raid in raids], on_conflict=["id"]).execute()
+
+
+@timed(storage_latency)
+async def get_archived_raids(limit: int, since: datetime | None = None) -> list[Raid]:
+    # 최근 일정부터
+    query = services.supabase.table("raids_archive").select("*")
+    if since:
+        query = query.gte("datetime", since.isoformat())
+    result = await query.order("datetime", desc=True).limit(limit).execute()
+    return [Raid.from_row(row) for row in result.data]
@@ -0,0 +1,79 @@
+import asyncio
+import os
+
+import discord
+
+from config import settings
+from models import Raid, RosterDiff
+from raid_store import raid_store
+from tasks.outbox import outbox
+from views.announcement import announcement_embed
+
+# 명단 변경 후 공지 임베드를 고치기까지 모으는 시간(초) — 메시지당 이 간격에 최대 한 번 edit
+ANNOUNCE_EDIT_DEBOUNCE = float(os.getenv("ANNOUNCE_EDIT_DEBOUNCE", "2.0"))
+
+
+async def refresh_announcement(bot, raid: Raid):
+    """캐시에 있는 현재 상태로 공지 임베드를 다시 그린다 (조회 없이 바로 수정, 버튼은 유지)"""
+    channel_id = settings.raid_announcement_channel_id
+    channel = bot.get_channel(channel_id) or await bot.fetch_channel(channel_id)
+    try:
+        await channel.get_partial_message(raid.message_id).edit(embed=announcement_embed(raid))
+    except discord.NotFound:
+        pass  # 공지가 지워졌으면 고칠 것도 없음
+
+
+@outbox.handler("refresh_announcement")
+async def _refresh_announcement(bot, payload: dict):
+    # 실행 시점의 상태로 그리므로 기록 순서가 밀려도 오래된 인원 수로 덮어쓰지 않는다
+    raid = await raid_store.get(payload["raid_id"])
+    if raid is None or not raid.message_id:
+        return
+    await refresh_announcement(bot, raid)
+
+
+class AnnouncementUpdater:
+    """
+    공지 임베드의 참여/대기 인원을 실시간으로 갱신.
+    명단이 바뀌면 일정별로 표시만 해두고, ANNOUNCE_EDIT_DEBOUNCE 뒤 한 번에 edit.
+    edit 중에 또 바뀌면 끝난 뒤 한 번 더 — 반응 40개가 몰려도 edit는 1~2번.
+    """
+
+    def __init__(self, debounce: float = ANNOUNCE_EDIT_DEBOUNCE):
+        self._debounce = debounce
+        self._bot = None
+        self._dirty: set[str] = set()
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def touch(self, raid_id: str):
+        self._dirty.add(raid_id)
+        task = self._tasks.get(raid_id)
+        if task is None or task.done():
+            self._tasks[raid_id] = asyncio.create_task(self._flush_loop(raid_id))
+
+    def _on_roster_change(self, raid: Raid, diff: RosterDiff):
+        if self._bot is not None:
+            self.touch(raid.id)
+
+    async def _flush_loop(self, raid_id: str):
+        try:
+            while raid_id in self._dirty:
+                await asyncio.sleep(self._debounce)
+                self._dirty.discard(raid_id)
+                raid = await raid_store.get(raid_id)
+                if raid is None or not raid.message_id:
+                    return  # 삭제/보관됐거나 아직 공지 전 (공지할 때 현재 인원으로 그려짐)
+                try:
+                    await refresh_announcement(self._bot, raid)
+                except Exception as e:
+                    print(f"[announce] 공지 인원 갱신 실패 raid={raid.key}: {e}")
+        finally:
+            self._tasks.pop(raid_id, None)
+
+    def start(self, bot):
+        if self._bot is None:
+            raid_store.add_roster_listener(self._on_roster_change)
+        self._bot = bot
+
+
+announcement_updater = AnnouncementUpdater()
@@ -0,0 +1,97 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import discord
+
+import supabase_storage as storage
+from config import settings
+from models import Raid
+from raid_store import raid_store
+from utils.datetime_util import KST
+
+# 시작 후 이만큼 지난 일정을 보관 / 실행 주기(초) / 한 번에 옮길 일정 수
+ARCHIVE_AFTER = timedelta(hours=float(os.getenv("RAID_ARCHIVE_AFTER_HOURS", "24")))
+ARCHIVE_INTERVAL = int(os.getenv("RAID_ARCHIVE_INTERVAL", "3600"))
+ARCHIVE_BATCH = int(os.getenv("RAID_ARCHIVE_BATCH", "100"))
+
+
+def finished_embed(raid: Raid) -> discord.Embed:
+    embed = discord.Embed(
+        title="🏁 종료된 자쿰 일정",
+        description=(
+            f"📅 **일시:** {raid.key}\n"
+            f"👥 **참여:** {raid.roster.participant_count} / {raid.max_participants}\n"
+            f"📝 **특이사항:**\n{raid.note or '없음'}"
+        ),
+        color=discord.Color.dark_grey()
+    )
+    embed.set_footer(text="신청이 마감된 일정입니다.")
+    return embed
+
+
+class RaidArchiver:
+    """
+    끝난 일정을 raids → raids_archive로 옮기는 백그라운드 작업.
+    배치마다 보관함에 upsert → 공지 메시지를 '종료'로 수정 → raids / 발송 기록 삭제 → 캐시에서 제거.
+    보관을 먼저 하므로 중간에 실패해도 다음 실행에서 같은 배치를 다시 처리하면 된다.
+    """
+
+    def __init__(self):
+        self._bot = None
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    async def _mark_finished(self, raids: list[Raid]):
+        channel = self._bot.get_channel(settings.raid_announcement_channel_id) if self._bot else None
+        if channel is None:
+            return
+        for raid in raids:
+            if not raid.message_id:
+                continue
+            try:
+                # 버튼도 함께 제거 (조회 없이 바로 수정)
+                await channel.get_partial_message(raid.message_id).edit(embed=finished_embed(raid), view=None)
+            except discord.NotFound:
+                pass
+            except Exception as e:
+                print(f"[archiver] 공지 수정 실패 raid={raid.key}: {e}")
+
+    async def run_once(self) -> int:
+        """보관한 일정 수 반환"""
+        cutoff = datetime.now(KST) - ARCHIVE_AFTER
+        total = 0
+        async with self._lock:
+            while True:
+                raids = await storage.get_raids_before(cutoff, ARCHIVE_BATCH)
+                if not raids:
+                    break
+                ids = [raid.id for raid in raids]
+                await storage.archive_raids(raids)
+                await self._mark_finished(raids)
+                await storage.delete_raids(ids)
+                await storage.delete_reminder_deliveries(ids)
+                raid_store.forget(ids)
+                total += len(raids)
+                if len(raids) < ARCHIVE_BATCH:
+                    break
+        return total
+
+    def start(self, bot):
+        self._bot = bot
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                archived = await self.run_once()
+                if archived:
+                    print(f"[archiver] archived {archived} raids")
+            except Exception as e:
+                print(f"[archiver] archive error: {e}")
+            await asyncio.sleep(ARCHIVE_INTERVAL)
+
+
+archiver = RaidArchiver()
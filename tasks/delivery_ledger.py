@@ -0,0 +1,41 @@
+import supabase_storage as storage
+
+
+class DeliveryLedger:
+    """
+    리마인더 발송 기록 (raid_id, offset, user_id).
+    부팅 시 예정 일정들의 기록을 한 번에 메모리 set으로 올려두고, 이후 조회는 O(1).
+    발송 성공분은 Supabase reminder_deliveries 테이블에 즉시 기록한다.
+    """
+
+    def __init__(self):
+        self._delivered: set[tuple[str, int, int]] = set()
+
+    async def load(self, raid_ids: list[str]):
+        rows = []
+        for i in range(0, len(raid_ids), storage.IN_CHUNK):
+            rows += await storage.get_reminder_deliveries(raid_ids[i:i + storage.IN_CHUNK])
+        self._delivered = {(r["raid_id"], int(r["offset_minutes"]), int(r["user_id"])) for r in rows}
+        print(f"[ledger] loaded {len(self._delivered)} deliveries for {len(raid_ids)} raids")
+
+    def is_delivered(self, raid_id: str, offset: int, user_id: int) -> bool:
+        return (raid_id, offset, user_id) in self._delivered
+
+    def pending(self, raid_id: str, offset: int, user_ids: list[int]) -> list[int]:
+        return [uid for uid in user_ids if not self.is_delivered(raid_id, offset, uid)]
+
+    def forget(self, raid_id: str):
+        """일정 시각이 바뀌면 예전 시각 기준 발송 기록은 무효 (저장소 삭제는 호출한 쪽에서)"""
+        self._delivered = {key for key in self._delivered if key[0] != raid_id}
+
+    async def record(self, raid_id: str, offset: int, user_ids: list[int]):
+        if not user_ids:
+            return
+        # 저장이 실패해도 이 프로세스 안에서는 중복 발송하지 않도록 메모리 먼저 반영
+        self._delivered.update((raid_id, offset, uid) for uid in user_ids)
+        await storage.record_reminder_deliveries([
+            {"raid_id": raid_id, "offset_minutes": offset, "user_id": str(uid)} for uid in user_ids
+        ])
+
+
+ledger = DeliveryLedger()
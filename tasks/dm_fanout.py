@@ -0,0 +1,129 @@
+import asyncio
+import os
+import random
+from dataclasses import dataclass
+
+import discord
+
+from utils.metrics import dms_total
+
+bot = None  # 전역 변수로 봇 인스턴스 저장
+
+# 동시 발송 수 / 재시도 횟수 (환경변수로 조절)
+MAX_CONCURRENCY = int(os.getenv("DM_MAX_CONCURRENCY", "5"))
+MAX_RETRIES = int(os.getenv("DM_MAX_RETRIES", "3"))
+
+# guild.query_members 한 번에 조회 가능한 최대 인원
+_QUERY_CHUNK = 100
+
+
+def set_bot_instance(bot_instance):
+    global bot
+    bot = bot_instance
+
+
+@dataclass
+class DeliveryResult:
+    user_id: int
+    ok: bool
+    error: str | None = None
+
+
+def _retry_after(e: discord.HTTPException, attempt: int) -> float | None:
+    """재시도 대기 시간. 재시도하면 안 되는 오류면 None"""
+    if e.status == 429:
+        headers = getattr(e.response, "headers", None) or {}
+        value = headers.get("Retry-After") or headers.get("X-RateLimit-Reset-After")
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return 2 ** attempt
+    if e.status >= 500:
+        return 2 ** attempt + random.random()
+    return None
+
+
+class DMFanout:
+    """
+    여러 유저에게 같은 DM을 보내는 공용 발송기.
+    - 유저 조회: 캐시 → 길드 멤버 일괄 조회 → 남은 것만 fetch_user 병렬
+    - 발송: 세마포어로 동시 발송 수 제한, 429는 Retry-After 만큼 대기 후 재시도
+    - 결과: 수신자별 성공/실패 목록
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, max_retries: int = MAX_RETRIES):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._max_retries = max_retries
+
+    async def resolve_users(self, user_ids: list[int]) -> dict[int, discord.abc.User]:
+        users = {}
+        missing = []
+        for uid in user_ids:
+            user = bot.get_user(uid)
+            if user:
+                users[uid] = user
+            else:
+                missing.append(uid)
+
+        # 길드 멤버는 게이트웨이로 100명씩 한 번에 조회
+        for guild in bot.guilds:
+            if not missing:
+                break
+            for i in range(0, len(missing), _QUERY_CHUNK):
+                try:
+                    members = await guild.query_members(user_ids=missing[i:i + _QUERY_CHUNK], limit=_QUERY_CHUNK)
+                except Exception as e:
+                    print(f"[dm_fanout] query_members 실패 guild={guild.id}: {e}")
+                    continue
+                for member in members:
+                    users[member.id] = member
+            missing = [uid for uid in missing if uid not in users]
+
+        async def fetch(uid):
+            async with self._semaphore:
+                try:
+                    users[uid] = await bot.fetch_user(uid)
+                except Exception:
+                    pass
+
+        await asyncio.gather(*(fetch(uid) for uid in missing))
+        return users
+
+    async def _send_one(self, uid: int, user, content: str) -> DeliveryResult:
+        if user is None:
+            return DeliveryResult(uid, False, "user not found")
+
+        for attempt in range(self._max_retries + 1):
+            try:
+                async with self._semaphore:
+                    await user.send(content)
+                return DeliveryResult(uid, True)
+            except discord.Forbidden:
+                return DeliveryResult(uid, False, "DM closed")
+            except discord.HTTPException as e:
+                delay = _retry_after(e, attempt)
+                if delay is None or attempt == self._max_retries:
+                    return DeliveryResult(uid, False, f"HTTP {e.status}")
+                await asyncio.sleep(delay)
+            except Exception as e:
+                return DeliveryResult(uid, False, str(e))
+        return DeliveryResult(uid, False, "retries exhausted")
+
+    async def send(self, user_ids, content: str, label: str = "dm") -> list[DeliveryResult]:
+        ids = list(dict.fromkeys(int(uid) for uid in user_ids))  # 순서 유지 중복 제거
+        if not ids:
+            return []
+        users = await self.resolve_users(ids)
+        results = await asyncio.gather(*(self._send_one(uid, users.get(uid), content) for uid in ids))
+
+        failed = [r for r in results if not r.ok]
+        kind = label.split(" ", 1)[0]
+        dms_total.inc(len(results) - len(failed), label=kind, result="ok")
+        dms_total.inc(len(failed), label=kind, result="failed")
+        print(f"[dm_fanout] {label}: {len(results) - len(failed)}/{len(results)} sent")
+        for r in failed:
+            print(f"[dm_fanout] {label}: DM 실패 uid={r.user_id}: {r.error}")
+        return results
+
+
+fanout = DMFanout()
@@ -0,0 +1,36 @@
+"""outbox로 실행하는 공용 부수효과 (DM 발송 / 공지 메시지 수정)"""
+import discord
+
+from tasks.dm_fanout import fanout
+from tasks.outbox import outbox
+
+
+@outbox.handler("dm")
+async def _send_dm(bot, payload: dict):
+    # 수신자별 실패(DM 차단 등)는 재시도하지 않는다 — 이미 받은 사람에게 중복 발송 방지
+    await fanout.send(payload["user_ids"], payload["content"], label=payload.get("label", "dm"))
+
+
+@outbox.handler("edit_message")
+async def _edit_message(bot, payload: dict):
+    channel = bot.get_channel(payload["channel_id"]) or await bot.fetch_channel(payload["channel_id"])
+    kwargs = {"embed": discord.Embed.from_dict(payload["embed"])}
+    if payload.get("remove_view"):
+        kwargs["view"] = None
+    try:
+        await channel.get_partial_message(payload["message_id"]).edit(**kwargs)
+    except discord.NotFound:
+        pass  # 공지가 이미 지워졌으면 할 일 없음
+
+
+def enqueue_dm(user_ids, content: str, label: str, raid_id: str | None = None, key: str | None = None) -> bool:
+    user_ids = [int(uid) for uid in user_ids]
+    if not user_ids:
+        return False
+    return outbox.enqueue("dm", {"user_ids": user_ids, "content": content, "label": label}, key=key, raid_id=raid_id)
+
+
+def enqueue_message_edit(channel_id: int, message_id: int, embed: discord.Embed, raid_id: str | None = None,
+                         key: str | None = None, remove_view: bool = False) -> bool:
+    payload = {"channel_id": channel_id, "message_id": message_id, "embed": embed.to_dict(), "remove_view": remove_view}
+    return outbox.enqueue("edit_message", payload, key=key, raid_id=raid_id)
@@ -0,0 +1,117 @@
+import asyncio
+import os
+from datetime import date
+
+from notion_client.errors import APIResponseError
+
+from notion_storage import _extract, iter_pages
+from utils.metrics import cache_hit
+
+# 증분 동기화 주기(초) / 몇 번마다 전체 동기화할지 (노션에서 삭제된 페이지 정리용)
+SYNC_INTERVAL = int(os.getenv("NOTION_SYNC_INTERVAL", "300"))
+FULL_SYNC_EVERY = int(os.getenv("NOTION_FULL_SYNC_EVERY", "12"))
+
+
+class SettlementMirror:
+    """
+    노션 정산 DB의 로컬 사본.
+    last_edited_time이 마지막 동기화 이후인 페이지만 받아 _extract 결과로 저장하고,
+    명령어/자동완성은 메모리에서 바로 응답한다.
+    """
+
+    def __init__(self):
+        self._records: dict[str, dict] = {}
+        self._sorted: list[dict] = []  # 날짜 내림차순
+        self._by_date: dict[date, dict] = {}  # 날짜별 대표(가장 최근 수정) 레코드
+        self._last_edited: str | None = None
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self.synced = asyncio.Event()
+
+    # ---------- 동기화 ----------
+    async def sync(self, full: bool = False) -> int:
+        """변경된 페이지 수 반환"""
+        async with self._lock:
+            since = None if full else self._last_edited
+            # 노션 last_edited_time은 분 단위로 잘리므로 on_or_after로 겹치게 받는다
+            flt = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": since}} if since else None
+            sorts = [{"timestamp": "last_edited_time", "direction": "ascending"}]
+
+            fresh = {}
+            async for pages in iter_pages(flt, sorts):
+                for page in pages:
+                    fresh[page["id"]] = _extract(page)
+
+            if full:
+                self._records = fresh
+            else:
+                self._records.update(fresh)
+            if fresh:
+                self._last_edited = max(
+                    [r["last_edited_time"] for r in fresh.values() if r["last_edited_time"]] + [self._last_edited or ""]
+                )
+            self._reindex()
+            self.synced.set()
+            return len(fresh)
+
+    def _reindex(self):
+        records = [r for r in self._records.values() if r["date"]]
+        records.sort(key=lambda r: (r["date"], r["last_edited_time"] or ""), reverse=True)
+        self._sorted = records
+        self._by_date = {}
+        for r in records:
+            self._by_date.setdefault(r["date"], r)
+
+    def start(self):
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        rounds = 0
+        while True:
+            full = rounds % FULL_SYNC_EVERY == 0
+            try:
+                changed = await self.sync(full=full)
+                print(f"[notion_sync] {'full' if full else 'incremental'} sync: {changed} pages, total {len(self._records)}")
+            except APIResponseError as e:
+                print(f"[notion_sync] Notion API 오류({e.status})")
+            except Exception as e:
+                print(f"[notion_sync] sync error: {e}")
+            rounds += 1
+            await asyncio.sleep(SYNC_INTERVAL)
+
+    # ---------- 스냅샷 ----------
+    def snapshot(self) -> dict:
+        records = [{**r, "date": r["date"].isoformat() if r["date"] else None} for r in self._records.values()]
+        return {"records": records, "last_edited": self._last_edited}
+
+    def restore(self, data: dict) -> int:
+        """스냅샷으로 사본을 채운다 (첫 동기화가 전체 동기화라 그때 노션 기준으로 다시 맞춰짐)"""
+        if self.synced.is_set():
+            return 0
+        self._records = {
+            r["id"]: {**r, "date": date.fromisoformat(r["date"]) if r["date"] else None}
+            for r in data.get("records", [])
+        }
+        self._last_edited = data.get("last_edited")
+        self._reindex()
+        self.synced.set()
+        return len(self._records)
+
+    # ---------- 조회 (메모리) ----------
+    def by_date(self, target: date) -> dict | None:
+        record = self._by_date.get(target)
+        cache_hit("notion_mirror", record is not None)
+        return record
+
+    def recent(self, limit: int = 1) -> list[dict]:
+        return self._sorted[:limit]
+
+    def dates(self, limit: int | None = None) -> list[str]:
+        """최근 날짜부터 'YYYY-MM-DD' 문자열 (중복 제거)"""
+        result = [d.isoformat() for d in self._by_date]
+        return result[:limit] if limit else result
+
+
+settlement_mirror = SettlementMirror()
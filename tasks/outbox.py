@@ -0,0 +1,162 @@
+import asyncio
+import json
+import os
+import sqlite3
+import time
+
+from config import settings
+
+# 동시 실행 워커 수 / 최대 시도 횟수 / 완료 기록 보관 기간(초, 멱등 키 중복 방지용)
+OUTBOX_WORKERS = int(os.getenv("OUTBOX_WORKERS", "4"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_RETENTION = float(os.getenv("OUTBOX_RETENTION_DAYS", "7")) * 86400
+
+# status: 0 대기, 1 완료, 2 포기
+_SCHEMA = """
+create table if not exists effects (
+    id integer primary key autoincrement,
+    key text unique,
+    kind text not null,
+    raid_id text,
+    payload text not null,
+    status integer not null default 0,
+    attempts integer not null default 0,
+    next_at real not null,
+    last_error text,
+    created_at real not null
+);
+create index if not exists effects_pending on effects (status, id);
+"""
+
+
+class Outbox:
+    """
+    핸들러가 기록만 하고 바로 응답할 수 있게 하는 로컬 outbox (sqlite, state_dir).
+    - enqueue(kind, payload, key, raid_id): key가 같은 효과는 한 번만 기록 (멱등 키)
+    - 워커 풀이 등록된 handler(bot, payload)를 실행, 실패하면 지수 백오프로 재시도
+    - 같은 raid_id의 효과는 기록된 순서대로 하나씩 (앞의 것이 끝나거나 포기될 때까지 뒤는 대기)
+    재시작하면 끝나지 않은 효과를 이어서 실행한다 (at-least-once).
+    """
+
+    def __init__(self, path: str | None = None, workers: int = OUTBOX_WORKERS):
+        self._path = path
+        self._db: sqlite3.Connection | None = None
+        self._workers = workers
+        self._handlers = {}
+        self._running: set[int] = set()
+        self._busy_raids: set[str] = set()
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._bot = None
+
+    # ---------- 저장 ----------
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            path = self._path
+            if path is None:
+                os.makedirs(settings.state_dir, exist_ok=True)
+                path = os.path.join(settings.state_dir, "outbox.sqlite3")
+            # 한 줄짜리 insert/update뿐이라 이벤트 루프에서 바로 실행
+            self._db = sqlite3.connect(path, isolation_level=None)
+            self._db.execute("pragma journal_mode=wal")
+            self._db.executescript(_SCHEMA)
+        return self._db
+
+    def handler(self, kind: str):
+        """@outbox.handler("kind") async def run(bot, payload): ..."""
+        def decorator(func):
+            self._handlers[kind] = func
+            return func
+        return decorator
+
+    def enqueue(self, kind: str, payload: dict, key: str | None = None, raid_id: str | None = None) -> bool:
+        """기록되면 True, 같은 key가 이미 있으면 False"""
+        now = time.time()
+        cursor = self.db.execute(
+            "insert or ignore into effects (key, kind, raid_id, payload, next_at, created_at) values (?, ?, ?, ?, ?, ?)",
+            (key, kind, raid_id, json.dumps(payload, ensure_ascii=False), now, now),
+        )
+        self._wakeup.set()
+        return cursor.rowcount == 1
+
+    def pending(self) -> int:
+        return self.db.execute("select count(*) from effects where status = 0").fetchone()[0]
+
+    # ---------- 실행 ----------
+    def _claim(self):
+        """실행 가능한 효과 하나 (raid별 순서 유지), 없으면 (None, 다음 확인까지 대기 초)"""
+        now = time.time()
+        blocked: set[str] = set()
+        next_due = None
+        rows = self.db.execute(
+            "select id, kind, raid_id, payload, attempts, next_at from effects where status = 0 order by id"
+        )
+        for row in rows:
+            effect_id, _, raid_id, _, _, next_at = row
+            if effect_id in self._running:
+                continue
+            if raid_id:
+                if raid_id in blocked or raid_id in self._busy_raids:
+                    continue
+                blocked.add(raid_id)  # 같은 raid의 뒤 효과는 이번 것이 끝나야 실행
+            if next_at > now:
+                next_due = next_at if next_due is None else min(next_due, next_at)
+                continue
+            return row, None
+        return None, (next_due - now if next_due else None)
+
+    async def _execute(self, row):
+        effect_id, kind, raid_id, payload, attempts, _ = row
+        try:
+            handler = self._handlers.get(kind)
+            if handler is None:
+                raise RuntimeError(f"no handler for {kind}")
+            await handler(self._bot, json.loads(payload))
+        except Exception as e:
+            attempts += 1
+            if attempts >= OUTBOX_MAX_ATTEMPTS:
+                print(f"[outbox] {kind}#{effect_id} 포기 ({attempts}회): {e}")
+                self.db.execute("update effects set status = 2, attempts = ?, last_error = ? where id = ?",
+                                (attempts, str(e), effect_id))
+            else:
+                delay = min(2 ** attempts, 300)
+                print(f"[outbox] {kind}#{effect_id} 실패, {delay}s 후 재시도: {e}")
+                self.db.execute("update effects set attempts = ?, next_at = ?, last_error = ? where id = ?",
+                                (attempts, time.time() + delay, str(e), effect_id))
+        else:
+            self.db.execute("update effects set status = 1, attempts = ? where id = ?", (attempts + 1, effect_id))
+
+    async def _worker(self):
+        while True:
+            # claim 전에 clear해야 그 사이 들어온 enqueue 알림을 놓치지 않는다
+            self._wakeup.clear()
+            row, wait = self._claim()
+            if row is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            effect_id, raid_id = row[0], row[2]
+            self._running.add(effect_id)
+            if raid_id:
+                self._busy_raids.add(raid_id)
+            try:
+                await self._execute(row)
+            finally:
+                self._running.discard(effect_id)
+                self._busy_raids.discard(raid_id)
+                self._wakeup.set()  # 같은 raid의 다음 효과를 기다리는 워커 깨우기
+
+    def start(self, bot):
+        self._bot = bot
+        if any(not t.done() for t in self._tasks):
+            return
+        self.db.execute("delete from effects where status != 0 and created_at < ?", (time.time() - OUTBOX_RETENTION,))
+        print(f"[outbox] {self.pending()} pending effects")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self._workers)]
+
+
+outbox = Outbox()
@@ -0,0 +1,110 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+
+import discord
+
+from config import settings
+from models import Raid
+from raid_store import raid_store
+from tasks.signup_engine import signup_engine
+from utils.metrics import reconcile_corrections
+
+# 동시에 반응을 조회할 일정 수
+RECONCILE_CONCURRENCY = int(os.getenv("RECONCILE_CONCURRENCY", "4"))
+
+
+@dataclass
+class ReconcileReport:
+    raids: int = 0
+    added: int = 0
+    removed: int = 0
+    writes: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+    def summary(self) -> str:
+        return (f"{self.raids}개 일정 확인, 추가 {self.added}명 / 제거 {self.removed}명, "
+                f"저장 {self.writes}회, 실패 {self.failed}건 ({self.elapsed:.2f}s)")
+
+
+async def _reactors(message: discord.Message, bot_user_id: int) -> set[int]:
+    reaction = next((r for r in message.reactions if str(r.emoji) == "✅"), None)
+    if reaction is None or reaction.count <= (1 if reaction.me else 0):
+        return set()
+    # users()는 100명 단위로 페이지를 넘긴다
+    return {user.id async for user in reaction.users(limit=None) if user.id != bot_user_id}
+
+
+async def reconcile_raid(channel, raid: Raid, bot_user_id: int) -> tuple[int, int]:
+    """공지의 ✅ 반응과 저장된 명단을 맞춘다. (추가, 제거) 인원 반환"""
+    # 반응 목록을 받는 동안(여러 번 await) 처리된 실시간 반응은 그쪽이 최신이므로 대조에서 제외
+    with signup_engine.track(raid.id) as touched:
+        message = await channel.fetch_message(raid.message_id)
+        reactors = await _reactors(message, bot_user_id)
+
+        # 조회 직후 await 없이 반영: 이후 들어오는 반응 이벤트는 signup_engine이 이어서 처리
+        stale = [uid for uid in raid.participants + raid.waitlist if uid not in reactors and uid not in touched]
+        fresh = [uid for uid in sorted(reactors) if uid not in raid.roster and uid not in touched]
+        for uid in stale:
+            raid_store.leave(raid, uid)
+        for uid in fresh:
+            raid_store.join(raid, uid)
+
+    if stale or fresh:
+        await raid_store.persist_roster(raid.id)  # 일정당 저장 한 번
+    return len(fresh), len(stale)
+
+
+async def reconcile_signups(bot, raids: list[Raid] | None = None,
+                            concurrency: int = RECONCILE_CONCURRENCY) -> ReconcileReport:
+    """다운/재연결 중 놓친 반응을 예정 일정 전체에 대해 보정"""
+    started = time.perf_counter()
+    report = ReconcileReport()
+    channel = bot.get_channel(settings.raid_announcement_channel_id)
+    if channel is None:
+        channel = await bot.fetch_channel(settings.raid_announcement_channel_id)
+
+    targets = [raid for raid in (raids if raids is not None else await raid_store.upcoming()) if raid.message_id]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(raid: Raid):
+        async with semaphore:
+            try:
+                added, removed = await reconcile_raid(channel, raid, bot.user.id)
+            except discord.NotFound:
+                print(f"[reconcile] 공지 메시지 없음 raid={raid.key}")
+                report.failed += 1
+                return
+            except Exception as e:
+                print(f"[reconcile] 실패 raid={raid.key}: {e}")
+                report.failed += 1
+                return
+        report.added += added
+        report.removed += removed
+        report.writes += 1 if added or removed else 0
+
+    await asyncio.gather(*(one(raid) for raid in targets))
+    report.raids = len(targets)
+    report.elapsed = time.perf_counter() - started
+    reconcile_corrections.inc(report.added, action="join")
+    reconcile_corrections.inc(report.removed, action="leave")
+    print(f"[reconcile] {report.summary()}")
+    return report
+
+
+_startup_task: asyncio.Task | None = None
+
+
+def start(bot):
+    """부팅 직후 한 번 백그라운드로 보정 (on_ready를 막지 않음)"""
+    global _startup_task
+    if _startup_task is None:
+        _startup_task = asyncio.create_task(_reconcile_when_fresh(bot))
+
+
+async def _reconcile_when_fresh(bot):
+    # 스냅샷으로 시작했다면 저장소 재검증이 끝난 명단을 기준으로
+    await raid_store.wait_fresh()
+    await reconcile_signups(bot)
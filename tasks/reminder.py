@@ -1,105 +1,170 @@
+import asyncio
+import heapq
+import itertools
+import os
 from datetime import datetime, timedelta
-from discord.ext import tasks
-from supabase_storage import get_all_raids
-from utils.datetime_util import parse_kst, KST
 
-bot = None  # 전역 변수로 봇 인스턴스 저장
+from raid_store import raid_store
+from tasks.delivery_ledger import ledger
+from tasks.dm_fanout import fanout
+from models import Raid
+from utils.datetime_util import KST
+from utils.metrics import reminder_duration, timed
 
-# 직전 루프 시각(알림 중복/누락 방지용)
-_last_tick: datetime | None = None
+# 일정에 알림 시점이 없을 때 쓰는 기본값 (공대 시작 N분 전, 쉼표 구분)
+DEFAULT_OFFSETS = [int(m) for m in os.getenv("REMINDER_OFFSETS_MINUTES", "1440,60").split(",") if m.strip()]
+
+# 재시작 중 지나간 알림을 부팅 시 보충 발송하는 허용 범위
+CATCH_UP_GRACE = timedelta(minutes=int(os.getenv("REMINDER_CATCH_UP_MINUTES", "30")))
 
 # 디버그 로그 토글 (원하면 환경변수로도 제어 가능)
 DEBUG = True
 
 
-def set_bot_instance(bot_instance):
-    global bot
-    bot = bot_instance
-
+def parse_offsets(text: str) -> list[int] | None:
+    """"1440, 60" → [1440, 60] (빈 문자열이면 None = 기본값 사용)"""
+    if not text or not text.strip():
+        return None
+    offsets = sorted({int(m) for m in text.replace(" ", "").split(",") if m}, reverse=True)
+    if any(m <= 0 for m in offsets):
+        raise ValueError("offset must be positive")
+    return offsets
 
-async def _get_user(uid: int):
-    """유저 캐시 미스 보완."""
-    user = bot.get_user(uid)
-    if user is None:
-        try:
-            user = await bot.fetch_user(uid)
-        except Exception:
-            return None
-    return user
 
+def raid_offsets(raid: Raid) -> list[int]:
+    return raid.reminder_offsets or DEFAULT_OFFSETS
 
-async def send_raid_reminder(raid, message_type):
-    participants = raid.get("participants", [])
-    if not participants:
-        if DEBUG:
-            print(f"[reminder] skip: participants empty for {raid.get('datetime')}")
-        return
-
-    for uid in participants:
-        try:
-            user = await _get_user(int(uid))
-            if not user:
-                print(f"[reminder] 유저 {uid}를 찾을 수 없음")
-                continue
-            await user.send(
-                f"🔔 **{message_type}**\n"
-                f"자쿰 공대 **{raid['datetime']}** 에 참여 예정이에요!"
-            )
-            if DEBUG:
-                print(f"[reminder] DM sent to {uid} ({message_type})")
-
-        except Exception as e:
-            print(f"[reminder] DM 실패 uid={uid}: {e}")
 
+def offset_label(minutes: int) -> str:
+    if minutes % 60 == 0:
+        return f"공대 시작 {minutes // 60}시간 전"
+    return f"공대 시작 {minutes}분 전"
 
-@tasks.loop(minutes=5)
-async def check_upcoming_raids():
-    """지난 루프~이번 루프 사이에 '목표시각을 통과'했으면 알림 발송."""
-    global _last_tick
-    now = datetime.now(KST)
 
-    # 첫 루프에서는 기준점만 잡고 종료 (다음 루프부터 판정)
-    if _last_tick is None:
-        _last_tick = now
+@timed(reminder_duration)
+async def send_raid_reminder(raid: Raid, minutes: int):
+    message_type = offset_label(minutes)
+    # 이미 발송된 참여자는 제외 (재시작/보충 발송 시 중복 방지)
+    participants = ledger.pending(raid.id, minutes, raid.participants)
+    if not participants:
         if DEBUG:
-            print(f"[reminder] first tick; anchor set to {now.isoformat()}")
+            print(f"[reminder] skip: nothing pending for {raid.key} ({message_type})")
         return
 
-    window_start, window_end = _last_tick, now
-    _last_tick = now
-
-    if DEBUG:
-        print(f"[reminder] window {window_start.isoformat()} → {window_end.isoformat()}")
+    results = await fanout.send(
+        participants,
+        f"🔔 **{message_type}**\n"
+        f"자쿰 공대 **{raid.key}** 에 참여 예정이에요!",
+        label=f"reminder {raid.key} -{minutes}m",
+    )
 
-    # 최신 일정 조회
     try:
-        raids = get_all_raids()
+        await ledger.record(raid.id, minutes, [r.user_id for r in results if r.ok])
     except Exception as e:
-        print(f"[reminder] 일정 조회 실패: {e}")
-        return
-
-    for raid in raids:
+        print(f"[reminder] 발송 기록 저장 실패: {e}")
+
+
+class ReminderScheduler:
+    """
+    알림 발송 시각을 미리 계산해 min-heap에 넣어두고, 가장 가까운 시각까지만 잠드는 스케줄러.
+    일정 생성/수정/삭제는 RaidStore 변경 알림으로 받아 heap을 부분 갱신한다.
+    수정/삭제된 일정의 기존 항목은 세대(generation) 번호로 무효화 (lazy deletion).
+    부팅 시(rebuild)에는 CATCH_UP_GRACE 안에 지나간 알림도 넣어 바로 보충 발송한다.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[datetime, int, str, int, int]] = []  # (발송 시각, seq, raid_id, 세대, offset)
+        self._generation: dict[str, int] = {}
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    # ---------- heap 갱신 ----------
+    def schedule_raid(self, raid: Raid, now: datetime | None = None, catch_up: timedelta = timedelta(0)):
+        now = now or datetime.now(KST)
+        gen = self._generation.get(raid.id, 0) + 1
+        self._generation[raid.id] = gen
+        for minutes in raid_offsets(raid):
+            fire_at = raid.starts_at - timedelta(minutes=minutes)
+            if fire_at > now - catch_up:
+                heapq.heappush(self._heap, (fire_at, next(self._seq), raid.id, gen, minutes))
+        self._wakeup.set()
+
+    def unschedule_raid(self, raid_id: str):
+        # 세대만 지우면 heap에 남은 항목은 꺼낼 때 버려진다
+        self._generation.pop(raid_id, None)
+        self._wakeup.set()
+
+    def rebuild(self, raids: list[Raid], catch_up: timedelta = timedelta(0)):
+        self._heap.clear()
+        self._generation.clear()
+        now = datetime.now(KST)
+        for raid in raids:
+            self.schedule_raid(raid, now, catch_up)
+        if DEBUG:
+            print(f"[reminder] heap rebuilt: {len(self._heap)} reminders")
+
+    def on_store_event(self, event: str, raid: Raid | None):
+        if event == "upsert":
+            self.schedule_raid(raid)
+        elif event == "delete":
+            self.unschedule_raid(raid.id)
+        elif event == "load":
+            self.rebuild(raid_store.cached())
+
+    def _is_live(self, entry) -> bool:
+        _, _, raid_id, gen, _ = entry
+        return self._generation.get(raid_id) == gen
+
+    # ---------- 실행 루프 ----------
+    def start(self):
+        if self._task and not self._task.done():
+            return
+        raid_store.add_listener(self.on_store_event)
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        raids = await raid_store.all()
+        # 보충 범위 안에 걸리는 일정의 발송 기록만 미리 로드
+        horizon = datetime.now(KST) - CATCH_UP_GRACE
+        live = [r for r in raids if r.starts_at > horizon]
         try:
-            raid_time = parse_kst(raid["datetime"])
+            await ledger.load([r.id for r in live])
         except Exception as e:
-            print(f"[reminder] bad datetime ({raid.get('datetime')}): {e}")
-            continue
-
-        t1h = raid_time - timedelta(hours=1)
-        t24h = raid_time - timedelta(hours=24)
-
-        if DEBUG:
-            print(f"[reminder] raid={raid['datetime']} t-1h={t1h.time()} t-24h={t24h.time()} participants={len(raid.get('participants', []))}")
-
-        # 지난 루프~이번 루프 사이를 '통과'했는지로 판정 (루프 타이밍/지연 무관)
-        if window_start <= t1h < window_end:
-            await send_raid_reminder(raid, "공대 시작 1시간 전")
-
-        if window_start <= t24h < window_end:
-            await send_raid_reminder(raid, "공대 시작 24시간 전")
+            print(f"[reminder] 발송 기록 로드 실패: {e}")
+        self.rebuild(live, catch_up=CATCH_UP_GRACE)
+        while True:
+            try:
+                await self._run_once()
+            except Exception as e:
+                # 예외로 루프가 멈추지 않도록
+                print(f"[reminder] loop error: {e}")
+                await asyncio.sleep(5)
+
+    async def _run_once(self):
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+
+        self._wakeup.clear()
+        if not self._heap:
+            await self._wakeup.wait()
+            return
+
+        delay = (self._heap[0][0] - datetime.now(KST)).total_seconds()
+        if delay > 0:
+            try:
+                # 새 일정이 더 빠를 수 있으므로 변경 알림이 오면 다시 계산
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            return
+
+        _, _, raid_id, _, minutes = heapq.heappop(self._heap)
+        raid = await raid_store.get(raid_id)
+        if raid:
+            if DEBUG:
+                print(f"[reminder] fire raid={raid.key} offset={minutes}m")
+            asyncio.create_task(send_raid_reminder(raid, minutes))
 
 
-# 루프 에러 핸들러(예외로 루프 정지 방지)
-@check_upcoming_raids.error
-async def _reminder_error(e):
-    print(f"[reminder] loop error: {e}")
\ No newline at end of file
+scheduler = ReminderScheduler()
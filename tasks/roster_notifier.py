@@ -0,0 +1,25 @@
+from models import Raid, RosterDiff
+from raid_store import raid_store
+from tasks.effects import enqueue_dm
+
+
+def on_roster_change(raid: Raid, diff: RosterDiff):
+    """대기 → 참여 승격 / 정원 축소로 인한 대기 전환을 당사자에게만 DM"""
+    if diff.promoted:
+        enqueue_dm(
+            diff.promoted,
+            f"🎉 `{raid.key}` 자쿰 공대 대기에서 **참여 확정**으로 변경되었어요!",
+            label=f"promote {raid.key}",
+            raid_id=raid.id,
+        )
+    if diff.demoted:
+        enqueue_dm(
+            diff.demoted,
+            f"⚠️ `{raid.key}` 자쿰 공대 정원이 {raid.max_participants}명으로 줄어 **대기자**로 변경되었어요.",
+            label=f"demote {raid.key}",
+            raid_id=raid.id,
+        )
+
+
+def start():
+    raid_store.add_roster_listener(on_roster_change)
@@ -0,0 +1,116 @@
+import asyncio
+import os
+from contextlib import contextmanager
+
+from raid_store import raid_store
+
+# 참여자 명단 저장을 모아서 보내는 대기 시간 (초)
+FLUSH_DEBOUNCE = float(os.getenv("SIGNUP_FLUSH_DEBOUNCE", "1.0"))
+
+
+class SignupEngine:
+    """
+    ✅ 반응으로 들어오는 참여/취소를 일정별로 직렬 처리하는 엔진.
+    - 반응 이벤트는 받은 순서대로 메시지별 큐에 쌓이고, 큐마다 워커 하나가 순서대로 처리 (대기자 순번 보장)
+    - 변경은 RaidStore 캐시의 명단에 즉시 반영하고, Supabase 저장은 FLUSH_DEBOUNCE 동안 모아서 한 번만
+    """
+
+    def __init__(self, debounce: float = FLUSH_DEBOUNCE):
+        self._debounce = debounce
+        self._queues: dict[int, asyncio.Queue] = {}
+        self._workers: dict[int, asyncio.Task] = {}
+        self._dirty: set[str] = set()
+        self._flushers: dict[str, asyncio.Task] = {}
+        self._touched: dict[str, list[set[int]]] = {}  # 명단 대조 중인 일정 → 그동안 반응한 유저
+        self._resumed = asyncio.Event()  # 해제되어 있으면 반응을 큐에 쌓아 두기만 한다
+        self._resumed.set()
+
+    # ---------- 입력 ----------
+    def join(self, message_id: int, user_id: int):
+        self._submit(message_id, "join", user_id)
+
+    def leave(self, message_id: int, user_id: int):
+        self._submit(message_id, "leave", user_id)
+
+    def _submit(self, message_id: int, action: str, user_id: int):
+        # await 없이 큐에 넣어야 게이트웨이 이벤트 순서가 그대로 유지된다
+        queue = self._queues.get(message_id)
+        if queue is None:
+            queue = self._queues[message_id] = asyncio.Queue()
+        queue.put_nowait((action, int(user_id)))
+        if message_id not in self._workers:
+            self._workers[message_id] = asyncio.create_task(self._drain(message_id, queue))
+
+    # ---------- 처리 ----------
+    async def _drain(self, message_id: int, queue: asyncio.Queue):
+        try:
+            while not queue.empty():
+                await self._resumed.wait()
+                action, user_id = queue.get_nowait()
+                try:
+                    raid = await raid_store.get_by_message_id(message_id)
+                    if raid is None:
+                        continue
+                    for touched in self._touched.get(raid.id, ()):
+                        touched.add(user_id)
+                    apply = raid_store.join if action == "join" else raid_store.leave
+                    if apply(raid, user_id):
+                        self._mark_dirty(raid.id)
+                except Exception as e:
+                    print(f"[signup] {action} 처리 실패 message={message_id} user={user_id}: {e}")
+        finally:
+            self._workers.pop(message_id, None)
+            if queue.empty():
+                self._queues.pop(message_id, None)
+
+    @contextmanager
+    def track(self, raid_id: str):
+        """블록 동안 이 일정에 반응을 처리한 유저 id를 모은다 (명단 대조가 실시간 반응을 되돌리지 않게)"""
+        touched: set[int] = set()
+        self._touched.setdefault(raid_id, []).append(touched)
+        try:
+            yield touched
+        finally:
+            trackers = self._touched[raid_id]
+            trackers.remove(touched)
+            if not trackers:
+                del self._touched[raid_id]
+
+    # ---------- 저장 ----------
+    def _mark_dirty(self, raid_id: str):
+        self._dirty.add(raid_id)
+        if raid_id not in self._flushers:
+            self._flushers[raid_id] = asyncio.create_task(self._flush_loop(raid_id))
+
+    async def _flush_loop(self, raid_id: str):
+        try:
+            while raid_id in self._dirty:
+                await asyncio.sleep(self._debounce)
+                # 저장 중 들어온 변경은 다시 dirty가 되어 한 번 더 저장된다
+                self._dirty.discard(raid_id)
+                try:
+                    await raid_store.persist_roster(raid_id)
+                except Exception as e:
+                    print(f"[signup] 명단 저장 실패 raid={raid_id}: {e} (재시도 예정)")
+                    self._dirty.add(raid_id)
+        finally:
+            self._flushers.pop(raid_id, None)
+
+    def pause(self):
+        """반응 처리 중지 — 이후 반응은 받은 순서대로 큐에 쌓였다가 resume() 후 처리"""
+        self._resumed.clear()
+
+    def resume(self):
+        self._resumed.set()
+
+    async def flush_all(self):
+        """종료 전 대기 중인 명단 저장을 즉시 반영"""
+        for raid_id in list(self._dirty):
+            self._dirty.discard(raid_id)
+            try:
+                await raid_store.persist_roster(raid_id)
+            except Exception as e:
+                print(f"[signup] 명단 저장 실패 raid={raid_id}: {e}")
+
+
+signup_engine = SignupEngine()
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import os
+import struct
+import time
+import zlib
+
+from config import settings
+from raid_store import raid_store
+from tasks.notion_sync import settlement_mirror
+from tasks.signup_engine import signup_engine
+from user_directory import user_directory
+
+# 저장 주기(초) / 이보다 오래된 스냅샷은 무시(시간) / 저장소 재검증 실패 시 재시도 간격(초)
+SNAPSHOT_INTERVAL = int(os.getenv("SNAPSHOT_INTERVAL", "300"))
+SNAPSHOT_MAX_AGE = float(os.getenv("SNAPSHOT_MAX_AGE_HOURS", "168")) * 3600
+REVALIDATE_RETRY = int(os.getenv("SNAPSHOT_REVALIDATE_RETRY", "30"))
+
+# 파일 형식: magic(6) + 형식 버전(uint16, big endian) + zlib(JSON)
+MAGIC = b"ZKSNAP"
+VERSION = 1
+_HEADER = struct.Struct(">6sH")
+
+
+def _pack(body: bytes) -> bytes:
+    return _HEADER.pack(MAGIC, VERSION) + zlib.compress(body, 6)
+
+
+def decode(data: bytes) -> dict | None:
+    """magic / 버전이 다르거나 깨진 파일이면 None (콜드 스타트로 진행)"""
+    if len(data) < _HEADER.size:
+        return None
+    magic, version = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        return None
+    try:
+        return json.loads(zlib.decompress(data[_HEADER.size:]))
+    except (zlib.error, ValueError):
+        return None
+
+
+class CacheSnapshot:
+    """
+    raid_store / user_directory / settlement_mirror 캐시를 로컬 파일로 주기 저장.
+    부팅 때 바로 읽어 들여 저장소 응답을 기다리지 않고 조회 명령에 응답하고,
+    저장소 재검증(load(force=True))은 성공할 때까지 백그라운드에서 재시도한다.
+    재검증 전까지 ✅ 반응은 signup_engine 큐에 쌓아 두고, 명단 저장은 raid_store가 거부한다.
+    """
+
+    def __init__(self, path: str | None = None):
+        self._path = path
+        self._task: asyncio.Task | None = None
+        self._revalidate_task: asyncio.Task | None = None
+
+    @property
+    def path(self) -> str:
+        return self._path or os.path.join(settings.state_dir, "cache_snapshot.bin")
+
+    def _payload(self) -> dict:
+        return {
+            "saved_at": time.time(),
+            "raids": raid_store.snapshot(),
+            "users": user_directory.snapshot(),
+            "settlements": settlement_mirror.snapshot(),
+        }
+
+    def restore(self) -> bool:
+        """스냅샷을 읽어 캐시를 채웠으면 True"""
+        started = time.perf_counter()
+        try:
+            with open(self.path, "rb") as f:
+                payload = decode(f.read())
+        except OSError:
+            return False
+        if payload is None:
+            print("[snapshot] 형식이 다르거나 손상된 스냅샷, 무시")
+            return False
+        if time.time() - payload.get("saved_at", 0) > SNAPSHOT_MAX_AGE:
+            print("[snapshot] 오래된 스냅샷, 무시")
+            return False
+
+        # 스냅샷 명단 위에서는 신청을 처리하지 않는다 (재검증 후 저장소 명단에 순서대로 반영)
+        signup_engine.pause()
+        raids = raid_store.restore(payload.get("raids", []))
+        users = user_directory.restore(payload.get("users", []))
+        settlements = settlement_mirror.restore(payload.get("settlements", {}))
+        print(f"[snapshot] restored raids={raids} users={users} settlements={settlements} "
+              f"in {(time.perf_counter() - started) * 1000:.1f}ms")
+        return True
+
+    async def save(self):
+        # 직렬화는 캐시가 바뀌지 않게 이벤트 루프에서, 압축/쓰기는 스레드에서
+        body = json.dumps(self._payload(), ensure_ascii=False, separators=(",", ":")).encode()
+        await asyncio.to_thread(self._write, body)
+
+    def _write(self, body: bytes):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_pack(body))
+        os.replace(tmp, self.path)  # 쓰다 죽어도 이전 스냅샷은 온전히
+
+    async def _revalidate(self):
+        while True:
+            try:
+                # 반응 처리는 restore 때부터 멈춰 있으므로 로드 도중 옛 Raid 객체에 반영되는 신청이 없다
+                await raid_store.load(force=True)
+                signup_engine.resume()
+                await user_directory.revalidate()
+                print("[snapshot] 저장소 재검증 완료")
+                return
+            except Exception as e:
+                print(f"[snapshot] 저장소 재검증 실패, {REVALIDATE_RETRY}s 후 재시도: {e}")
+                await asyncio.sleep(REVALIDATE_RETRY)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(SNAPSHOT_INTERVAL)
+            try:
+                await self.save()
+            except Exception as e:
+                print(f"[snapshot] save error: {e}")
+
+    def start(self, revalidate: bool = False):
+        if revalidate and self._revalidate_task is None:
+            self._revalidate_task = asyncio.create_task(self._revalidate())
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run())
+
+
+snapshot = CacheSnapshot()
@@ -0,0 +1,114 @@
+import os
+import time
+from dataclasses import asdict
+
+import supabase_storage as storage
+from models import User
+from utils.metrics import cache_hit, cache_requests
+
+# 캐시 만료 시간(초). 0이면 등록/수정 시 무효화만 하고 만료시키지 않음
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "0"))
+
+
+class UserDirectory:
+    """
+    users 테이블의 프로세스 전역 캐시 (discord_id 기준 + nickname 보조 인덱스).
+    필요한 유저만 조회해서 채우고, 미등록 유저도 None으로 기억해 반복 조회를 막는다.
+    """
+
+    def __init__(self, ttl: float = USER_CACHE_TTL):
+        self._ttl = ttl
+        self._by_id: dict[int, tuple[User | None, float]] = {}
+        self._by_nickname: dict[str, int] = {}
+        self.version = 0  # 캐시된 유저의 직업/등록 상태가 바뀔 때마다 증가 (렌더링 캐시 키)
+
+    def _fresh(self, discord_id: int) -> bool:
+        entry = self._by_id.get(discord_id)
+        if entry is None:
+            return False
+        return not self._ttl or time.monotonic() - entry[1] < self._ttl
+
+    def _put(self, discord_id: int, user: User | None):
+        previous = self._by_id.get(discord_id)
+        if previous is not None and (previous[0] and previous[0].job) != (user and user.job):
+            self.version += 1
+        self._drop(discord_id)
+        self._by_id[discord_id] = (user, time.monotonic())
+        if user and user.nickname:
+            self._by_nickname[user.nickname] = discord_id
+
+    def _drop(self, discord_id: int):
+        entry = self._by_id.pop(discord_id, None)
+        if entry and entry[0] and self._by_nickname.get(entry[0].nickname) == discord_id:
+            del self._by_nickname[entry[0].nickname]
+
+    # ---------- 조회 ----------
+    async def get_many(self, discord_ids) -> dict[int, User]:
+        """등록된 유저만 {discord_id: user}로 반환 (캐시에 없는 것만 한 번에 조회)"""
+        ids = list(dict.fromkeys(int(uid) for uid in discord_ids))
+        missing = [uid for uid in ids if not self._fresh(uid)]
+        cache_requests.inc(len(ids) - len(missing), cache="user_directory", result="hit")
+        cache_requests.inc(len(missing), cache="user_directory", result="miss")
+        for i in range(0, len(missing), storage.IN_CHUNK):
+            chunk = missing[i:i + storage.IN_CHUNK]
+            found = {u.discord_id: u for u in await storage.get_users(chunk)}
+            for uid in chunk:
+                self._put(uid, found.get(uid))
+
+        result = {}
+        for uid in ids:
+            user = self._by_id.get(uid, (None, 0))[0]
+            if user:
+                result[uid] = user
+        return result
+
+    async def get(self, discord_id) -> User | None:
+        return (await self.get_many([discord_id])).get(int(discord_id))
+
+    async def find_by_nickname(self, nickname: str) -> User | None:
+        discord_id = self._by_nickname.get(nickname)
+        hit = bool(discord_id and self._fresh(discord_id))
+        cache_hit("user_directory", hit)
+        if hit:
+            return self._by_id[discord_id][0]
+
+        user = await storage.get_user_by_nickname(nickname)
+        if user:
+            self._put(user.discord_id, user)
+        return user
+
+    # ---------- 스냅샷 ----------
+    def snapshot(self) -> list[dict]:
+        """등록된 유저만 (미등록 기억은 저장하지 않음)"""
+        return [asdict(user) for user, _ in self._by_id.values() if user]
+
+    def restore(self, rows: list[dict]) -> int:
+        for user in map(User.from_row, rows):
+            self._put(user.discord_id, user)
+        return len(rows)
+
+    async def revalidate(self):
+        """캐시된 유저를 저장소 기준으로 다시 조회 (스냅샷으로 채운 뒤 백그라운드에서)"""
+        ids = list(self._by_id)
+        for i in range(0, len(ids), storage.IN_CHUNK):
+            chunk = ids[i:i + storage.IN_CHUNK]
+            found = {u.discord_id: u for u in await storage.get_users(chunk)}
+            for uid in chunk:
+                self._put(uid, found.get(uid))
+
+    # ---------- 쓰기 ----------
+    async def register(self, discord_id: int, nickname: str, level: int, job: str):
+        result = await storage.register_user(discord_id, nickname, level, job)
+        self.invalidate(discord_id)
+        return result
+
+    def invalidate(self, discord_id=None):
+        self.version += 1
+        if discord_id is None:
+            self._by_id.clear()
+            self._by_nickname.clear()
+        else:
+            self._drop(int(discord_id))
+
+
+user_directory = UserDirectory()
@@ -12,4 +12,19 @@ def parse_kst(dt_str: str) -> datetime:
     dt = datetime.fromisoformat(dt_str)
     # 타임존이 있으면 KST로 변환, 없으면 KST 부여
     dt = dt.astimezone(KST) if dt.tzinfo else dt.replace(tzinfo=KST)
-    return dt
\ No newline at end of file
+    return dt
+
+def to_key(dt_str: str) -> str:
+    """
+    저장된 datetime 문자열을 "YYYY-MM-DD HH:MM" 형식의 일정 키로 정규화
+    예) "2025-08-12T13:30:00" → "2025-08-12 13:30"
+    """
+    return parse_kst(dt_str).strftime("%Y-%m-%d %H:%M")
+
+
+def to_timestamptz(dt_str: str) -> str:
+    """
+    저장용 timestamptz 문자열 (KST 오프셋 포함 ISO)
+    예) "2025-08-12 13:30" → "2025-08-12T13:30:00+09:00"
+    """
+    return parse_kst(dt_str).isoformat(timespec="seconds")
@@ -0,0 +1,165 @@
+import asyncio
+import functools
+import inspect
+import time
+from bisect import bisect_left
+
+# 기본 지연시간 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry = []
+
+
+def _labels_text(names, values, extra=None) -> str:
+    pairs = list(zip(names, values)) + (extra or [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, float] = {}
+        _registry.append(self)
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(str(labels.get(n, "")) for n in self.labelnames), 0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in self._values.items():
+            lines.append(f"{self.name}{_labels_text(self.labelnames, key)} {value}")
+        return lines
+
+
+class Gauge:
+    """값을 직접 set하거나, 렌더링 시점에 func()로 계산 ({라벨 튜플: 값} 반환)"""
+
+    def __init__(self, name: str, help: str, labelnames=(), func=None):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, float] = {}
+        self._func = func
+        _registry.append(self)
+
+    def set(self, value: float, **labels):
+        self._values[tuple(str(labels.get(n, "")) for n in self.labelnames)] = value
+
+    def render(self) -> list[str]:
+        values = self._func() if self._func else self._values
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        for key, value in values.items():
+            lines.append(f"{self.name}{_labels_text(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple, list] = {}  # 라벨 → [버킷별 개수..., 합계, 개수]
+        _registry.append(self)
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0] * (len(self.buckets) + 2)
+        i = bisect_left(self.buckets, value)
+        if i < len(self.buckets):
+            series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, series in self._series.items():
+            cumulative = 0
+            for bound, n in zip(self.buckets, series):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_labels_text(self.labelnames, key, [('le', bound)])} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels_text(self.labelnames, key, [('le', '+Inf')])} {series[-1]}")
+            lines.append(f"{self.name}_sum{_labels_text(self.labelnames, key)} {series[-2]}")
+            lines.append(f"{self.name}_count{_labels_text(self.labelnames, key)} {series[-1]}")
+        return lines
+
+
+def render() -> str:
+    """Prometheus 텍스트 포맷"""
+    lines = []
+    for metric in _registry:
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+
+def timed(histogram: Histogram, **labels):
+    """함수 실행 시간을 기록하는 데코레이터 (동기/비동기 모두). op 라벨은 함수 이름으로 채운다"""
+
+    def decorator(func):
+        op_labels = {"op": func.__name__, **labels} if "op" in histogram.labelnames else labels
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    histogram.observe(time.perf_counter() - started, **op_labels)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started, **op_labels)
+        return wrapper
+
+    return decorator
+
+
+# ---------- 공용 지표 ----------
+storage_latency = Histogram("bot_storage_seconds", "supabase_storage 호출 지연시간", ["op"])
+notion_latency = Histogram("bot_notion_seconds", "Notion API 호출 지연시간", ["op"])
+reactions_total = Counter("bot_reactions_total", "처리한 ✅ 반응 수", ["action"])
+commands_total = Counter("bot_commands_total", "실행된 슬래시 커맨드 수", ["command", "result"])
+dms_total = Counter("bot_dms_total", "DM 발송 결과", ["label", "result"])
+reminder_duration = Histogram("bot_reminder_dispatch_seconds", "리마인더 1회 발송 소요시간")
+loop_lag = Histogram("bot_event_loop_lag_seconds", "이벤트 루프 지연", buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0))
+cache_requests = Counter("bot_cache_requests_total", "캐시 조회 수", ["cache", "result"])
+reconcile_corrections = Counter("bot_reconcile_corrections_total", "반응 대조로 바로잡은 신청 수", ["action"])
+
+
+def _cache_hit_ratio():
+    totals = {}
+    for (cache, result), n in cache_requests._values.items():
+        hits, total = totals.get(cache, (0, 0))
+        totals[cache] = (hits + (n if result == "hit" else 0), total + n)
+    return {(cache,): hits / total for cache, (hits, total) in totals.items() if total}
+
+
+cache_hit_ratio = Gauge("bot_cache_hit_ratio", "캐시 적중률", ["cache"], func=_cache_hit_ratio)
+
+
+def cache_hit(cache: str, hit: bool):
+    cache_requests.inc(cache=cache, result="hit" if hit else "miss")
+
+
+async def monitor_loop_lag(interval: float = 0.5):
+    """interval만큼 잠들었다 깨어난 시각이 얼마나 늦었는지 기록"""
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        loop_lag.observe(max(0.0, time.perf_counter() - started - interval))
@@ -0,0 +1,33 @@
+import discord
+
+from models import Raid
+
+
+def announcement_embed(raid: Raid) -> discord.Embed:
+    """
+    공지 채널의 일정 안내 임베드 (생성 / 수정 / 실시간 인원 갱신 공용).
+    일정 상태만으로 다시 그릴 수 있어야 인원 갱신이 수정 표시를 덮어쓰지 않는다.
+    """
+    edited = raid.edited_at is not None
+    embed = discord.Embed(
+        title="🔔 변경사항이 있습니다!" if edited else "🔔 New 자쿰 공대 일정 생성!",
+        description=(
+            "━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+            f"📅 **일시:** {raid.starts_at.strftime('%Y-%m-%d (%a) %H:%M')}\n"
+            f"👥 **최대 인원:** {raid.max_participants}명\n\n"
+            "📝 **특이사항:**\n"
+            f"{raid.note or '지금부터 참여 신청 받습니다!'}\n"
+            "━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+            "✅ 반응을 눌러 참여를 신청하세요!"
+        ),
+        color=discord.Color.orange()
+    )
+    embed.add_field(name="✅ 참여", value=f"{raid.roster.participant_count} / {raid.max_participants}명", inline=True)
+    embed.add_field(name="🕐 대기", value=f"{raid.roster.waitlist_count}명", inline=True)
+    if edited:
+        embed.add_field(
+            name="✏️ 변경사항이 있습니다",
+            value=f"수정 시각: <t:{int(raid.edited_at.timestamp())}:f>",
+            inline=False
+        )
+    return embed
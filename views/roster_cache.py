@@ -0,0 +1,38 @@
+import os
+from collections import OrderedDict
+
+import discord
+
+from utils.metrics import cache_hit
+
+# 캐시에 보관할 최대 일정 수 (오래 안 쓰인 일정부터 제거)
+MAX_ENTRIES = int(os.getenv("ROSTER_CACHE_SIZE", "64"))
+
+
+class RosterEmbedCache:
+    """일정별 참여자 명단 embed 캐시. 버전 키가 달라지면 미스로 처리해 다시 렌더링한다."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[tuple, discord.Embed]] = OrderedDict()
+
+    def get(self, raid_id: str, version: tuple) -> discord.Embed | None:
+        entry = self._entries.get(raid_id)
+        hit = entry is not None and entry[0] == version
+        cache_hit("roster_embed", hit)
+        if not hit:
+            return None
+        self._entries.move_to_end(raid_id)
+        return entry[1]
+
+    def put(self, raid_id: str, version: tuple, embed: discord.Embed):
+        self._entries[raid_id] = (version, embed)
+        self._entries.move_to_end(raid_id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def evict(self, raid_id: str):
+        self._entries.pop(raid_id, None)
+
+
+roster_cache = RosterEmbedCache()
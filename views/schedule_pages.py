@@ -0,0 +1,105 @@
+import os
+from collections import OrderedDict
+from datetime import datetime
+
+import discord
+from discord.ui import View, button
+
+from models import Raid
+from raid_store import raid_store
+from utils.datetime_util import KST
+from utils.metrics import cache_hit
+
+# 한 페이지에 보여줄 일정 수 / 목록에 보여줄 특이사항 최대 길이 (embed description 4096자 제한)
+PAGE_SIZE = int(os.getenv("SCHEDULE_PAGE_SIZE", "5"))
+NOTE_PREVIEW = int(os.getenv("SCHEDULE_NOTE_PREVIEW", "300"))
+# 캐시에 보관할 최대 페이지 수
+MAX_PAGES = int(os.getenv("SCHEDULE_PAGE_CACHE_SIZE", "32"))
+
+
+def render_page(raids: list[Raid], page: int, pages: int, total: int) -> discord.Embed:
+    embed = discord.Embed(title="📋 자쿰 일정 목록", color=discord.Color.blurple())
+    embed.description = ""
+    for raid in raids:
+        formatted_dt = raid.starts_at.strftime("%Y-%m-%d (%a) %H:%M")
+        note = raid.note or "없음"
+        if len(note) > NOTE_PREVIEW:
+            note = note[:NOTE_PREVIEW] + "…"
+
+        embed.description += (
+            f"━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+            f"📅 **{formatted_dt}**\n"
+            f"- **참여**: {raid.roster.participant_count} / {raid.max_participants}\n"
+            f"- **대기자**: {raid.roster.waitlist_count}명\n"
+            f"- **특이사항**:\n{note}\n"
+        )
+    embed.set_footer(text=f"페이지 {page + 1} / {pages} · 총 {total}개 일정")
+    return embed
+
+
+class SchedulePages:
+    """
+    /일정확인 페이지 렌더링 + 캐시.
+    요청한 페이지의 일정만 정렬 인덱스에서 잘라 그리고, (목록 버전, 예정 일정 수, 페이지)가
+    같으면 이전에 만든 embed를 그대로 쓴다. 목록 버전이 같으면 정렬 인덱스도 같으므로
+    예정 일정 수만 보면 시간이 지나 빠진 일정까지 구분된다.
+    """
+
+    def __init__(self, page_size: int = PAGE_SIZE, max_pages: int = MAX_PAGES):
+        self._page_size = page_size
+        self._max_pages = max_pages
+        self._entries: OrderedDict[tuple, discord.Embed] = OrderedDict()
+
+    async def page(self, page: int, now: datetime | None = None) -> tuple[discord.Embed | None, int, int]:
+        """(embed, 실제 페이지 번호, 전체 페이지 수) — 예정 일정이 없으면 embed는 None"""
+        now = now or datetime.now(KST)
+        total = await raid_store.count_upcoming(now)
+        if total == 0:
+            return None, 0, 0
+        pages = -(-total // self._page_size)
+        page = max(0, min(page, pages - 1))  # 그 사이 일정이 줄었으면 마지막 페이지로
+
+        key = (raid_store.generation, total, page)
+        embed = self._entries.get(key)
+        cache_hit("schedule_page", embed is not None)
+        if embed is None:
+            raids = await raid_store.upcoming(now, limit=self._page_size, offset=page * self._page_size)
+            embed = render_page(raids, page, pages, total)
+            self._entries[key] = embed
+            while len(self._entries) > self._max_pages:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+        return embed, page, pages
+
+
+schedule_pages = SchedulePages()
+
+
+class SchedulePageView(View):
+    """이전 / 다음 버튼 (본인에게만 보이는 메시지라 누른 사람 확인은 생략)"""
+
+    def __init__(self, page: int, pages: int):
+        super().__init__(timeout=300)
+        self.page = page
+        self._sync(pages)
+
+    def _sync(self, pages: int):
+        self.prev_page.disabled = self.page <= 0
+        self.next_page.disabled = self.page >= pages - 1
+
+    async def _show(self, interaction: discord.Interaction, page: int):
+        embed, self.page, pages = await schedule_pages.page(page)
+        if embed is None:
+            await interaction.response.edit_message(content="📭 앞으로 예정된 일정이 없습니다.", embed=None, view=None)
+            return
+        self._sync(pages)
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    @button(label="◀ 이전", style=discord.ButtonStyle.secondary)
+    async def prev_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page - 1)
+
+    @button(label="다음 ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page + 1)